@@ -0,0 +1,105 @@
+import threading
+from collections import deque
+
+class ActivityFeed:
+    """
+    Bounded in-memory ring buffer of the most recent submissions.
+    It is seeded from the database once at startup and then appended to by
+    the submission writer after each commit, so reading recent activity
+    never touches the database. New entries are also pushed to subscribers
+    of the 'activity' topic.
+    """
+    TOPIC = 'activity'
+
+    def __init__(self, pool, broker=None, capacity=100):
+        self.pool = pool
+        self.broker = broker
+        self.capacity = capacity
+        self._entries = deque(maxlen=capacity)  # Oldest first
+        self._lock = threading.Lock()
+
+    def seed(self):
+        """Fill the buffer with the latest submissions from the database"""
+        try:
+            conn = self.pool.acquire()
+            cursor = conn.cursor()
+            # Served by idx_submissions_timestamp
+            cursor.execute("""
+                SELECT
+                    u.username,
+                    p.title,
+                    s.result,
+                    s.time_taken,
+                    s.timestamp
+                FROM submissions s
+                JOIN users u ON s.user_id = u.id
+                JOIN puzzles p ON s.puzzle_id = p.id
+                ORDER BY s.timestamp DESC, s.id DESC
+                LIMIT ?
+            """, (self.capacity,))
+            entries = [self._entry(*row) for row in cursor.fetchall()]
+            with self._lock:
+                self._entries.clear()
+                self._entries.extend(reversed(entries))
+            print(f"[DEBUG] Seeded activity feed with {len(entries)} submissions")
+        except Exception as e:
+            print(f"[ERROR] Failed to seed activity feed: {e}")
+        finally:
+            if 'conn' in locals():
+                self.pool.release(conn)
+
+    @staticmethod
+    def _entry(username, puzzle_title, result, time_taken, timestamp):
+        return {
+            'username': username,
+            'puzzle_title': puzzle_title,
+            'result': result,
+            'time_taken': time_taken,
+            'timestamp': timestamp
+        }
+
+    def recent(self, limit=10):
+        """Return up to limit entries, newest first"""
+        with self._lock:
+            entries = list(self._entries)
+        return entries[::-1][:max(0, limit)]
+
+    def on_commit(self, records):
+        """Submission writer listener: append committed submissions and push them"""
+        if not records:
+            return
+        names, titles = self._lookup_names(records)
+        entries = []
+        for record in records:
+            if record['user_id'] not in names or record['puzzle_id'] not in titles:
+                continue
+            entries.append(self._entry(
+                names[record['user_id']],
+                titles[record['puzzle_id']],
+                'correct' if record['is_correct'] else 'incorrect',
+                record['time_taken'],
+                record['timestamp']
+            ))
+        with self._lock:
+            self._entries.extend(entries)
+        if self.broker is not None:
+            for entry in entries:
+                self.broker.publish(self.TOPIC, entry)
+
+    def _lookup_names(self, records):
+        """Fetch usernames and puzzle titles for a batch of records"""
+        user_ids = list({record['user_id'] for record in records})
+        puzzle_ids = list({record['puzzle_id'] for record in records})
+        try:
+            conn = self.pool.acquire()
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT id, username FROM users WHERE id IN ({', '.join('?' * len(user_ids))})",
+                           user_ids)
+            names = dict(cursor.fetchall())
+            cursor.execute(f"SELECT id, title FROM puzzles WHERE id IN ({', '.join('?' * len(puzzle_ids))})",
+                           puzzle_ids)
+            titles = dict(cursor.fetchall())
+            return names, titles
+        finally:
+            if 'conn' in locals():
+                self.pool.release(conn)
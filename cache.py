@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with an optional per-entry TTL.
+    Writers call invalidate() after changing the underlying data. Readers that
+    compute a value outside the lock pass the generation they started from to
+    put(), so a result computed before an invalidation is never stored.
+    """
+    def __init__(self, max_entries=128, ttl=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0  # Bumped on every invalidation
+
+        self._entries = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._invalidations = 0
+
+    def get(self, key, default=None):
+        """Return the cached value for key, or default if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self._hits += 1
+                    return value
+                del self._entries[key]
+            self._misses += 1
+            return default
+
+    def put(self, key, value, generation=None):
+        """Store value under key unless the cache was invalidated since generation"""
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return False
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+            return True
+
+    def invalidate(self, key=None):
+        """Drop one entry, or every entry when key is None"""
+        with self._lock:
+            self.generation += 1
+            self._invalidations += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop every entry"""
+        self.invalidate()
+
+    def stats(self):
+        """Return entry count and hit/miss counters"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'invalidations': self._invalidations
+            }
+
+class ResourceVersions:
+    """
+    Monotonic version numbers for cacheable resources (puzzle list,
+    leaderboard, ...). Writers bump a resource after changing it; readers
+    attach the current version to responses so clients can ask "has this
+    changed since version N?". Versions never go below wall-clock
+    milliseconds, so they keep increasing across server restarts.
+    """
+    def __init__(self):
+        self._versions = {}
+        self._lock = threading.Lock()
+        self._seed = self._now()  # Version of every resource not bumped since startup
+
+    @staticmethod
+    def _now():
+        return int(time.time() * 1000)
+
+    def get(self, name):
+        """Return the current version of a resource"""
+        with self._lock:
+            return self._versions.get(name, self._seed)
+
+    def bump(self, *names):
+        """Advance the version of each named resource"""
+        now = self._now()
+        with self._lock:
+            for name in names:
+                self._versions[name] = max(self._versions.get(name, self._seed) + 1, now)
@@ -1,13 +1,33 @@
 import socket
 import json
 import os
+import threading
+import itertools
+import queue
+from collections import OrderedDict
+from protocol import LineReader
 
 class GameClient:
     TOKEN_FILE = "auth_token.txt"
+    # Reads the puzzle server versions; repeats send if_version and get back
+    # a bare not_modified when nothing changed
+    VERSIONED_ACTIONS = {"get_puzzles", "search_puzzles", "get_puzzle",
+                         "get_leaderboard", "get_recent_activity", "get_stats"}
+    VERSION_CACHE_SIZE = 64
 
-    def __init__(self, server_address):
+    def __init__(self, server_address, persistent=False):
         self.server_address = server_address
         self._auth_token = None
+        # Persistent mode keeps one keep-alive socket open to the server and
+        # sends every request over it instead of reconnecting per call
+        self.persistent = persistent
+        self._sock = None
+        self._reader = None
+        self._conn_lock = threading.Lock()
+        self._request_ids = itertools.count(1)
+        # (action, payload, auth_token) -> (version, response) of the last versioned read
+        self._versioned = OrderedDict()
+        self._version_lock = threading.Lock()
         self.load_token()
 
     @property
@@ -36,12 +56,16 @@ class GameClient:
 
     def send_request(self, action, payload):
         """Send a request to the server and receive response"""
+        if self.persistent:
+            return self.send_pipelined([(action, payload)])[0]
+
         try:
             request = {
                 "action": action,
                 "auth_token": self.auth_token,
                 "payload": payload or {}
             }
+            cache_key = self._add_if_version(request)
             request_str = json.dumps(request) + '\n'
             print(f"[DEBUG] 发送请求：{request_str}")  # 调试信息
             
@@ -49,23 +73,17 @@ class GameClient:
                 s.connect(self.server_address)
                 s.sendall(request_str.encode('utf-8'))
                 
-                buffer = ""
-                while True:
-                    chunk = s.recv(4096).decode('utf-8')
-                    if not chunk:
-                        break
-                    buffer += chunk
-                    if '\n' in buffer:
-                        break
-                
-                response_str = buffer.strip()
+                # Decode once per message so multi-byte characters split
+                # across recv() calls are not corrupted
+                line = LineReader(s, max_message_size=None).readline()
+                response_str = (line or b'').decode('utf-8').strip()
                 print(f"[DEBUG] 收到响应：{response_str}")  # 调试信息
                 
                 try:
                     response = json.loads(response_str)
                     if self.handle_invalid_token(response):
                         return {"status": "error", "message": "会话已过期，请重新登录"}
-                    return response
+                    return self._resolve_version(cache_key, response)
                 except json.JSONDecodeError as e:
                     print(f"[DEBUG] JSON解析错误：{e}, 原始响应：{response_str}")  # 调试信息
                     return None
@@ -77,6 +95,135 @@ class GameClient:
             print(f"[DEBUG] 未知错误：{e}")  # 调试信息
             raise RuntimeError(f"Unexpected error: {e}")
 
+    def send_pipelined(self, requests):
+        """
+        Send several (action, payload) requests back to back on the persistent
+        connection and return their responses in the same order.
+        Responses are matched to requests by request_id, so the server may
+        answer them in any order.
+        """
+        if not self.persistent:
+            return [self.send_request(action, payload) for action, payload in requests]
+
+        with self._conn_lock:
+            reused = self._sock is not None
+            try:
+                return self._exchange(requests)
+            except (socket.error, ConnectionError) as e:
+                self._close_connection()
+                if not reused:
+                    raise ConnectionError(f"Network error: {e}")
+                # The server may have closed an idle keep-alive connection;
+                # retry once on a fresh socket before giving up
+                print(f"[DEBUG] 连接已断开，正在重连：{e}")  # 调试信息
+            try:
+                return self._exchange(requests)
+            except (socket.error, ConnectionError) as e:
+                self._close_connection()
+                raise ConnectionError(f"Network error: {e}")
+
+    def _exchange(self, requests):
+        """Write all requests, then read until every request_id has a response"""
+        if self._sock is None:
+            self._sock = socket.create_connection(self.server_address)
+            self._reader = LineReader(self._sock, max_message_size=None)
+
+        order = []
+        cache_keys = {}
+        lines = []
+        for action, payload in requests:
+            request_id = next(self._request_ids)
+            order.append(request_id)
+            request = {
+                "action": action,
+                "auth_token": self.auth_token,
+                "payload": payload or {},
+                "request_id": request_id,
+                "keep_alive": True
+            }
+            cache_keys[request_id] = self._add_if_version(request)
+            lines.append(json.dumps(request) + '\n')
+        print(f"[DEBUG] 发送请求：{lines}")  # 调试信息
+        self._sock.settimeout(None)
+        self._sock.sendall(''.join(lines).encode('utf-8'))
+
+        responses = {}
+        while len(responses) < len(order):
+            line = self._reader.readline()
+            if line is None:
+                raise ConnectionError("Connection closed by server")
+            try:
+                response = json.loads(line)
+            except json.JSONDecodeError as e:
+                print(f"[DEBUG] JSON解析错误：{e}, 原始响应：{line}")  # 调试信息
+                continue
+            request_id = response.pop("request_id", None)
+            if request_id is None:
+                # A server without request_id support answers in order
+                request_id = order[len(responses)]
+            responses[request_id] = response
+        print(f"[DEBUG] 收到响应：{responses}")  # 调试信息
+
+        results = []
+        for request_id in order:
+            response = responses.get(request_id)
+            if self.handle_invalid_token(response):
+                response = {"status": "error", "message": "会话已过期，请重新登录"}
+            else:
+                response = self._resolve_version(cache_keys[request_id], response)
+            results.append(response)
+        return results
+
+    def _add_if_version(self, request):
+        """Add if_version to a versioned read we have a cached response for; returns its cache key"""
+        if request["action"] not in self.VERSIONED_ACTIONS:
+            return None
+        cache_key = (request["action"], json.dumps(request["payload"], sort_keys=True), request["auth_token"])
+        with self._version_lock:
+            cached = self._versioned.get(cache_key)
+        if cached is not None:
+            request["if_version"] = cached[0]
+        return cache_key
+
+    def _resolve_version(self, cache_key, response):
+        """Swap a not_modified reply for the cached body, or remember a new versioned body"""
+        if cache_key is None or not isinstance(response, dict):
+            return response
+        with self._version_lock:
+            if response.get("status") == "not_modified":
+                cached = self._versioned.get(cache_key)
+                if cached is not None and cached[0] == response.get("version"):
+                    self._versioned.move_to_end(cache_key)
+                    return cached[1]
+                self._versioned.pop(cache_key, None)
+                return {"status": "error", "message": "Cached response is no longer available, please retry"}
+            if response.get("status") == "success" and "version" in response:
+                self._versioned[cache_key] = (response["version"], response)
+                self._versioned.move_to_end(cache_key)
+                while len(self._versioned) > self.VERSION_CACHE_SIZE:
+                    self._versioned.popitem(last=False)
+        return response
+
+    def _close_connection(self):
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+        self._sock = None
+        self._reader = None
+
+    def close(self):
+        """Close the persistent connection, if any"""
+        with self._conn_lock:
+            self._close_connection()
+
+    def subscribe(self, topics):
+        """Start receiving pushes for topics on a dedicated connection"""
+        subscription = PushSubscription(self.server_address, topics)
+        subscription.start()
+        return subscription
+
     def register(self, username, password):
         """Register a new user"""
         try:
@@ -160,3 +307,72 @@ class GameClient:
             print(f"[Token] Clear failed: {e}")
         self._auth_token = None
 
+class PushSubscription:
+    """
+    Dedicated connection that subscribes to server push topics.
+    A background thread reads pushes and puts them on the messages queue,
+    so a UI thread can drain it without ever blocking on the network. The
+    connection is re-established with backoff if it drops.
+    Queue items are the subscribe response ({"type": "subscribed", ...})
+    followed by push messages ({"type": "push", "topic": ..., "data": ...}).
+    """
+    def __init__(self, server_address, topics, reconnect_delay=1, max_reconnect_delay=30):
+        self.server_address = server_address
+        self.topics = list(topics)
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.messages = queue.Queue()
+        self.connected = False
+        self._stopped = threading.Event()
+        self._sock = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        """Close the connection and end the reader thread"""
+        self._stopped.set()
+        sock = self._sock
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _run(self):
+        delay = self.reconnect_delay
+        while not self._stopped.is_set():
+            try:
+                self._sock = socket.create_connection(self.server_address)
+                reader = LineReader(self._sock, max_message_size=None)
+                self._sock.sendall((json.dumps({
+                    "action": "subscribe",
+                    "payload": {"topics": self.topics},
+                    "keep_alive": True
+                }) + '\n').encode('utf-8'))
+
+                while not self._stopped.is_set():
+                    line = reader.readline()
+                    if line is None:
+                        raise ConnectionError("Connection closed by server")
+                    message = json.loads(line)
+                    if message.get("type") == "push":
+                        self.messages.put(message)
+                    elif message.get("status") == "success":
+                        self.connected = True
+                        delay = self.reconnect_delay
+                        self.messages.put(dict(message, type="subscribed"))
+                    else:
+                        print(f"[DEBUG] 订阅失败：{message.get('message')}")  # 调试信息
+                        self._stopped.set()
+            except (OSError, ValueError) as e:
+                if not self._stopped.is_set():
+                    print(f"[DEBUG] 推送连接断开，{delay} 秒后重连：{e}")  # 调试信息
+            finally:
+                self.connected = False
+                if self._sock is not None:
+                    self._sock.close()
+                    self._sock = None
+            self._stopped.wait(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
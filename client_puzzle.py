@@ -2,8 +2,24 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 import json
 import time
+import queue
 from client_auth import GameClient
+from puzzle_cache import PuzzleCache
+from request_runner import RequestRunner
 from puzzle_creator_ui import PuzzleCreatorWindow  # Import puzzle creator
+from puzzle_grid_ui import PuzzleGrid
+
+PUZZLE_PAGE_SIZE = 50  # Puzzle summaries fetched per page
+LEADERBOARD_SIZE = 10
+ACTIVITY_SIZE = 10
+PUSH_POLL_MS = 200     # How often pushed updates are applied to the UI
+
+# Sort keys matching the server's ranking modes (smaller ranks higher)
+LEADERBOARD_KEYS = {
+    'speed': lambda e: (e.get('avg_time') or 0, -e.get('puzzles_solved', 0)),
+    'accuracy': lambda e: (-e.get('accuracy', 0), -e.get('total_attempts', 0)),
+    'solved': lambda e: (-e.get('puzzles_solved', 0), e.get('avg_time') or 0)
+}
 
 class PuzzleClient:
     def __init__(self, root):
@@ -13,7 +29,10 @@ class PuzzleClient:
         
         # Initialize two different clients
         self.auth_client = GameClient(("localhost", 5000))  # Authentication server
-        self.puzzle_client = GameClient(("localhost", 5001))  # Puzzle server
+        self.puzzle_client = GameClient(("localhost", 5001), persistent=True)  # Puzzle server, one keep-alive connection
+        self.puzzle_cache = PuzzleCache()  # Opened puzzles, reused while their content_hash matches
+        # Network calls run on worker threads so a slow server never freezes the window
+        self.requests = RequestRunner(self.root)
         self.current_user = None
         self.start_time = None  # Will be set when puzzle is loaded
         
@@ -58,7 +77,7 @@ class PuzzleClient:
         self.stats_frame.grid(row=0, column=0, padx=10, pady=10, sticky=(tk.W, tk.E))
         
         self.stats_labels = {}
-        for stat in ['puzzles_solved', 'avg_time', 'last_login']:
+        for stat in ['puzzles_solved', 'avg_time', 'best_time', 'accuracy', 'streak', 'last_login']:
             self.stats_labels[stat] = ttk.Label(self.stats_frame, text="")
             self.stats_labels[stat].pack(pady=5)
         
@@ -71,7 +90,7 @@ class PuzzleClient:
         sort_frame.pack(fill=tk.X, padx=5, pady=5)
         ttk.Label(sort_frame, text="Sort by:").pack(side=tk.LEFT, padx=5)
         self.leaderboard_sort = ttk.Combobox(sort_frame,
-                                           values=['By Speed', 'By Accuracy'],
+                                           values=['By Speed', 'By Accuracy', 'By Solved'],
                                            state='readonly',
                                            width=10)
         self.leaderboard_sort.pack(side=tk.LEFT, padx=5)
@@ -131,6 +150,22 @@ class PuzzleClient:
         ttk.Button(self.filter_frame, text="Apply Filters",
                   command=self.load_puzzles).grid(row=0, column=6, padx=5)
         
+        self.more_button = ttk.Button(self.filter_frame, text="More",
+                                      command=self.load_more_puzzles,
+                                      state='disabled')
+        self.more_button.grid(row=0, column=7, padx=5)
+        
+        ttk.Label(self.filter_frame, text="Search:").grid(row=1, column=0)
+        self.search_entry = ttk.Entry(self.filter_frame)
+        self.search_entry.grid(row=1, column=1, columnspan=3, sticky=(tk.W, tk.E))
+        self.search_entry.bind('<Return>', lambda e: self.search_puzzles())
+        ttk.Button(self.filter_frame, text="Search",
+                  command=self.search_puzzles).grid(row=1, column=4, padx=5)
+        
+        self.puzzles = []
+        self.puzzle_cursor = None  # Cursor for the next page of the puzzle list
+        self.search_offset = None  # Offset of the next page of search results
+        
         # Puzzle selection
         self.puzzle_list = ttk.Combobox(self.left_panel, state="readonly", width=50)
         self.puzzle_list.grid(row=2, column=0, columnspan=2, padx=5, pady=5)
@@ -142,6 +177,8 @@ class PuzzleClient:
         # Crossword grid
         self.grid_frame = ttk.Frame(self.left_panel)
         self.grid_frame.grid(row=4, column=0, columnspan=2, padx=5, pady=5)
+        self.puzzle_grid = PuzzleGrid(self.grid_frame, on_first_input=self.handle_first_input)
+        self.puzzle_grid.pack()
         
         # Clues frame
         self.clues_frame = ttk.Frame(self.left_panel)
@@ -152,78 +189,148 @@ class PuzzleClient:
                   command=self.submit_solution).grid(row=6, column=0, columnspan=2, pady=10)
         
         self.current_puzzle = None
-        self.grid_entries = []
+        self.leaderboard_entries = []
+        self.leaderboard_sort_type = 'speed'
+        self.activities = []
         
-        # Start periodic updates
+        # Leaderboard and activity changes are pushed by the server once logged in;
+        # polling is only a fallback while the push connection is down
+        self.subscription = None
         self.root.after(30000, self.periodic_update)  # Update every 30 seconds
     
     def periodic_update(self):
-        if self.current_user:
+        if self.current_user and not (self.subscription and self.subscription.connected):
             self.update_leaderboard()
             self.update_activity()
         self.root.after(30000, self.periodic_update)
     
+    def start_subscription(self):
+        if self.subscription is None:
+            self.subscription = self.puzzle_client.subscribe(['activity', 'leaderboard'])
+            self.root.after(PUSH_POLL_MS, self.process_pushes)
+    
+    def process_pushes(self):
+        # Apply everything the push thread has received since the last poll
+        activity_changed = False
+        leaderboard_changes = []
+        while True:
+            try:
+                message = self.subscription.messages.get_nowait()
+            except queue.Empty:
+                break
+            if message.get('type') == 'subscribed':
+                # (Re)connected: resynchronize in case pushes were missed
+                self.activities = message.get('data', {}).get('activities', [])[:ACTIVITY_SIZE]
+                activity_changed = True
+                self.update_leaderboard()
+            elif message.get('topic') == 'activity':
+                self.activities = ([message['data']] + self.activities)[:ACTIVITY_SIZE]
+                activity_changed = True
+            elif message.get('topic') == 'leaderboard':
+                leaderboard_changes.extend(message.get('data', {}).get('entries', []))
+        if activity_changed:
+            self.render_activity()
+        if leaderboard_changes:
+            self.apply_leaderboard_changes(leaderboard_changes)
+        self.root.after(PUSH_POLL_MS, self.process_pushes)
+    
+    def apply_leaderboard_changes(self, changes):
+        key = LEADERBOARD_KEYS[self.leaderboard_sort_type]
+        entries = {entry['username']: entry for entry in self.leaderboard_entries}
+        dropped = False
+        for change in changes:
+            old = entries.get(change['username'])
+            if old is not None and key(change) > key(old):
+                dropped = True
+            entries[change['username']] = change
+        if dropped and len(self.leaderboard_entries) >= LEADERBOARD_SIZE:
+            # Someone we do not know about may now rank above a listed user
+            self.update_leaderboard()
+            return
+        ranked = [entry for entry in entries.values()
+                  if self.leaderboard_sort_type != 'speed' or entry.get('puzzles_solved', 0) > 0]
+        ranked.sort(key=key)
+        self.leaderboard_entries = ranked[:LEADERBOARD_SIZE]
+        self.render_leaderboard()
+    
     def update_leaderboard(self):
         if not self.current_user:
             return
             
-        try:
-            print("[DEBUG] Getting leaderboard")
-            sort_type = 'speed' if self.leaderboard_sort.get() == 'By Speed' else 'accuracy'
-            response = self.puzzle_client.send_request("get_leaderboard", {
-                "sort_by": sort_type
-            })
-            print(f"[DEBUG] Leaderboard response: {response}")
-            
-            if response and response.get("status") == "success":
-                self.leaderboard_list.delete(0, tk.END)
-                leaderboard = response.get("leaderboard", [])
-                
-                # Add header
-                header = "Rank  Username        Avg Time   Puzzles" if sort_type == 'speed' else \
-                        "Rank  Username        Accuracy   Attempts"
-                self.leaderboard_list.insert(tk.END, header)
-                self.leaderboard_list.insert(tk.END, "-" * 50)
-                
-                for i, entry in enumerate(leaderboard, 1):
-                    if sort_type == 'speed':
-                        text = f"{i:2d}.   {entry['username']:<15} {entry.get('avg_time', 0):>6.1f}s   {entry.get('puzzles_solved', 0):>4d}"
-                    else:
-                        text = f"{i:2d}.   {entry['username']:<15} {entry.get('accuracy', 0):>6.1f}%    {entry.get('total_attempts', 0):>4d}"
-                    self.leaderboard_list.insert(tk.END, text)
+        print("[DEBUG] Getting leaderboard")
+        sort_type = {'By Speed': 'speed',
+                     'By Accuracy': 'accuracy',
+                     'By Solved': 'solved'}.get(self.leaderboard_sort.get(), 'speed')
+        payload = {"sort_by": sort_type, "limit": LEADERBOARD_SIZE}
+        self.requests.submit(
+            'leaderboard',
+            lambda: self.puzzle_client.send_request("get_leaderboard", payload),
+            lambda response: self.show_leaderboard(response, sort_type),
+            lambda e: self.show_request_error("Cannot update leaderboard", e)
+        )
+    
+    def show_leaderboard(self, response, sort_type):
+        print(f"[DEBUG] Leaderboard response: {response}")
+        if response and response.get("status") == "success":
+            self.leaderboard_sort_type = sort_type
+            self.leaderboard_entries = response.get("leaderboard", [])
+            self.render_leaderboard()
+        else:
+            print(f"[ERROR] Failed to get leaderboard: {(response or {}).get('message', 'Unknown error')}")
+    
+    def show_request_error(self, message, error):
+        print(f"[ERROR] {message}: {str(error)}")
+        messagebox.showerror("Error", f"{message}: {str(error)}")
+    
+    def render_leaderboard(self):
+        sort_type = self.leaderboard_sort_type
+        self.leaderboard_list.delete(0, tk.END)
+        
+        # Add header
+        header = "Rank  Username        Accuracy   Attempts" if sort_type == 'accuracy' else \
+                "Rank  Username        Avg Time   Puzzles"
+        self.leaderboard_list.insert(tk.END, header)
+        self.leaderboard_list.insert(tk.END, "-" * 50)
+        
+        for i, entry in enumerate(self.leaderboard_entries, 1):
+            if sort_type != 'accuracy':
+                text = f"{i:2d}.   {entry['username']:<15} {entry.get('avg_time', 0):>6.1f}s   {entry.get('puzzles_solved', 0):>4d}"
             else:
-                print(f"[ERROR] Failed to get leaderboard: {response.get('message', 'Unknown error')}")
-        except Exception as e:
-            print(f"[ERROR] Error updating leaderboard: {str(e)}")
-            messagebox.showerror("Error", f"Cannot update leaderboard: {str(e)}")
+                text = f"{i:2d}.   {entry['username']:<15} {entry.get('accuracy', 0):>6.1f}%    {entry.get('total_attempts', 0):>4d}"
+            self.leaderboard_list.insert(tk.END, text)
     
     def update_activity(self):
         if not self.current_user:
             return
             
-        try:
-            print("[DEBUG] Getting recent activity")
-            response = self.puzzle_client.send_request("get_recent_activity", {"limit": 10})
-            print(f"[DEBUG] Recent activity response: {response}")
-            
-            if response and response.get("status") == "success":
-                self.activity_list.delete(0, tk.END)
-                activities = response.get("activities", [])
-                
-                # Add header
-                self.activity_list.insert(tk.END, "Time              Username        Puzzle          Result  Time")
-                self.activity_list.insert(tk.END, "-" * 70)
-                
-                for activity in activities:
-                    result = "✓" if activity['result'] == "correct" else "✗"
-                    timestamp = activity.get('timestamp', '')[:16]  # Show only up to minutes
-                    text = f"{timestamp}  {activity['username']:<15} {activity['puzzle_title']:<15} {result}  {activity['time_taken']:>5.1f}s"
-                    self.activity_list.insert(tk.END, text)
-            else:
-                print(f"[ERROR] Failed to get recent activity: {response.get('message', 'Unknown error')}")
-        except Exception as e:
-            print(f"[ERROR] Error updating recent activity: {str(e)}")
-            messagebox.showerror("Error", f"Cannot update recent activity: {str(e)}")
+        print("[DEBUG] Getting recent activity")
+        self.requests.submit(
+            'activity',
+            lambda: self.puzzle_client.send_request("get_recent_activity", {"limit": ACTIVITY_SIZE}),
+            self.show_activity,
+            lambda e: self.show_request_error("Cannot update recent activity", e)
+        )
+    
+    def show_activity(self, response):
+        print(f"[DEBUG] Recent activity response: {response}")
+        if response and response.get("status") == "success":
+            self.activities = response.get("activities", [])
+            self.render_activity()
+        else:
+            print(f"[ERROR] Failed to get recent activity: {(response or {}).get('message', 'Unknown error')}")
+    
+    def render_activity(self):
+        self.activity_list.delete(0, tk.END)
+        
+        # Add header
+        self.activity_list.insert(tk.END, "Time              Username        Puzzle          Result  Time")
+        self.activity_list.insert(tk.END, "-" * 70)
+        
+        for activity in self.activities:
+            result = "✓" if activity['result'] == "correct" else "✗"
+            timestamp = activity.get('timestamp', '')[:16]  # Show only up to minutes
+            text = f"{timestamp}  {activity['username']:<15} {activity['puzzle_title']:<15} {result}  {activity['time_taken']:>5.1f}s"
+            self.activity_list.insert(tk.END, text)
     
     def update_ui_for_logged_in_user(self):
         print("[DEBUG] Updating UI for logged in state")
@@ -249,102 +356,182 @@ class PuzzleClient:
         
         # Load puzzle list
         self.load_puzzles()
+        
+        # Receive leaderboard and activity updates as they happen
+        self.start_subscription()
     
     def login(self):
         username = self.username_entry.get()
         password = self.password_entry.get()
-        
-        try:
-            response = self.auth_client.login(username, password)
-            if response and response.get("status") == "success":
-                self.current_user = username
-                self.auth_token = response.get("data", {}).get("auth_token")
-                # 同步令牌到谜题客户端
-                self.puzzle_client.auth_token = self.auth_token
-                print(f"[DEBUG] 登录成功，令牌已同步: {self.auth_token}")
-                self.update_ui_for_logged_in_user()
-            else:
-                messagebox.showerror("Error", response.get("message", "Login failed"))
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not login: {str(e)}")
+        self.requests.submit(
+            'auth',
+            lambda: self.auth_client.login(username, password),
+            lambda response: self.finish_login(username, response),
+            lambda e: messagebox.showerror("Error", f"Could not login: {str(e)}"),
+            supersede=False
+        )
+    
+    def finish_login(self, username, response):
+        if response and response.get("status") == "success":
+            self.current_user = username
+            self.auth_token = response.get("data", {}).get("auth_token")
+            # 同步令牌到谜题客户端
+            self.puzzle_client.auth_token = self.auth_token
+            print(f"[DEBUG] 登录成功，令牌已同步: {self.auth_token}")
+            self.update_ui_for_logged_in_user()
+        else:
+            messagebox.showerror("Error", (response or {}).get("message", "Login failed"))
     
     def register(self):
         username = self.username_entry.get()
         password = self.password_entry.get()
-        
-        try:
-            response = self.auth_client.register(username, password)
-            if response and response.get("status") == "success":
-                messagebox.showinfo("Success", "Registration successful! You can now login.")
-            else:
-                messagebox.showerror("Error", response.get("message", "Registration failed"))
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not register: {str(e)}")
+        self.requests.submit(
+            'auth',
+            lambda: self.auth_client.register(username, password),
+            self.finish_register,
+            lambda e: messagebox.showerror("Error", f"Could not register: {str(e)}"),
+            supersede=False
+        )
+    
+    def finish_register(self, response):
+        if response and response.get("status") == "success":
+            messagebox.showinfo("Success", "Registration successful! You can now login.")
+        else:
+            messagebox.showerror("Error", (response or {}).get("message", "Registration failed"))
     
     def update_statistics(self):
         if not self.current_user:
             return
             
-        try:
-            print("[DEBUG] Getting statistics")
-            response = self.puzzle_client.send_request("get_stats", {})
-            print(f"[DEBUG] Statistics response: {response}")
-            
-            if response and response.get("status") == "success":
-                stats = response.get("data", {})  # Get data from stats field
-                print(f"[DEBUG] Stats data: {stats}")  # Add debug log
+        print("[DEBUG] Getting statistics")
+        self.requests.submit(
+            'stats',
+            lambda: self.puzzle_client.send_request("get_stats", {}),
+            self.show_statistics,
+            self.show_statistics_error
+        )
+    
+    def show_statistics(self, response):
+        print(f"[DEBUG] Statistics response: {response}")
+        if response and response.get("status") == "success":
+            stats = response.get("data", {})  # Get data from stats field
+            print(f"[DEBUG] Stats data: {stats}")  # Add debug log
                 
-                # Handle None values with defaults
-                puzzles_solved = stats.get('puzzles_solved', 0)
-                avg_time = stats.get('avg_time', 0)
-                last_login = stats.get('last_login', 'Never')
+            # Handle None values with defaults
+            puzzles_solved = stats.get('puzzles_solved', 0)
+            avg_time = stats.get('avg_time', 0)
+            last_login = stats.get('last_login', 'Never')
                 
-                # Update labels with safe values
-                self.stats_labels['puzzles_solved'].config(
-                    text=f"Puzzles Solved: {puzzles_solved}")
-                self.stats_labels['avg_time'].config(
-                    text=f"Average Time: {avg_time:.1f}s" if avg_time is not None else "Average Time: 0.0s")
-                self.stats_labels['last_login'].config(
-                    text=f"Last Login: {last_login if last_login else 'Never'}")
-            else:
-                print(f"[ERROR] Failed to get statistics: {response.get('message', 'Unknown error')}")
-                # Set default values if failed to get statistics
-                self.stats_labels['puzzles_solved'].config(text="Puzzles Solved: 0")
-                self.stats_labels['avg_time'].config(text="Average Time: 0.0s")
-                self.stats_labels['last_login'].config(text="Last Login: Never")
-        except Exception as e:
-            print(f"[ERROR] Error updating statistics: {str(e)}")
-            # Set default values on error
+            # Update labels with safe values
+            self.stats_labels['puzzles_solved'].config(
+                text=f"Puzzles Solved: {puzzles_solved}")
+            self.stats_labels['avg_time'].config(
+                text=f"Average Time: {avg_time:.1f}s" if avg_time is not None else "Average Time: 0.0s")
+            self.stats_labels['last_login'].config(
+                text=f"Last Login: {last_login if last_login else 'Never'}")
+            best_time = stats.get('best_time')
+            self.stats_labels['best_time'].config(
+                text=f"Best Time: {best_time:.1f}s" if best_time is not None else "Best Time: -")
+            self.stats_labels['accuracy'].config(
+                text=f"Accuracy: {stats.get('accuracy', 0):.1f}% of {stats.get('attempts', 0)} attempts")
+            self.stats_labels['streak'].config(
+                text=f"Streak: {stats.get('streak', 0)} (best {stats.get('best_streak', 0)})")
+        else:
+            print(f"[ERROR] Failed to get statistics: {(response or {}).get('message', 'Unknown error')}")
+            # Set default values if failed to get statistics
             self.stats_labels['puzzles_solved'].config(text="Puzzles Solved: 0")
             self.stats_labels['avg_time'].config(text="Average Time: 0.0s")
             self.stats_labels['last_login'].config(text="Last Login: Never")
     
-    def load_puzzles(self):
+    def show_statistics_error(self, e):
+        print(f"[ERROR] Error updating statistics: {str(e)}")
+        # Set default values on error
+        self.stats_labels['puzzles_solved'].config(text="Puzzles Solved: 0")
+        self.stats_labels['avg_time'].config(text="Average Time: 0.0s")
+        self.stats_labels['last_login'].config(text="Last Login: Never")
+    
+    def load_puzzles(self, append=False):
         if not self.current_user:
             return
+        if append and not self.puzzle_cursor:
+            return
             
-        try:
-            print("[DEBUG] Sending get puzzle request, parameters: " + 
-                  str({'sort_by': self.sort_by.get(),
-                      'order': self.order.get(),
-                      'tag': self.tag.get() or None}))
-                      
-            response = self.puzzle_client.send_request("get_puzzles", {
-                "sort_by": self.sort_by.get(),
-                "order": self.order.get(),
-                "tag": self.tag.get() or None
-            })
+        # Only summaries are listed; the full puzzle is fetched when loaded
+        payload = {
+            "summary": True,
+            "sort_by": self.sort_by.get(),
+            "order": self.order.get(),
+            "tag": self.tag.get() or None,
+            "limit": PUZZLE_PAGE_SIZE
+        }
+        if append:
+            payload["cursor"] = self.puzzle_cursor
+        print("[DEBUG] Sending get puzzle request, parameters: " + str(payload))
+        
+        # Listing and searching share a key, so a newer filter or search
+        # supersedes a load that is still in flight
+        self.requests.submit(
+            'puzzles',
+            lambda: self.puzzle_client.send_request("get_puzzles", payload),
+            lambda response: self.finish_load_puzzles(response, append),
+            lambda e: messagebox.showerror("Error", f"Could not load puzzles: {str(e)}")
+        )
+    
+    def finish_load_puzzles(self, response, append):
+        if response and response.get("status") == "success":
+            data = response.get("data", {})
+            self.search_offset = None
+            self.puzzle_cursor = data.get("next_cursor")
+            self.show_puzzles(data.get("puzzles", []), append, bool(self.puzzle_cursor))
+        else:
+            messagebox.showerror("Error", (response or {}).get("message", "Could not load puzzles"))
+    
+    def search_puzzles(self, append=False):
+        if not self.current_user:
+            return
+        query = self.search_entry.get().strip()
+        if not query:
+            self.load_puzzles()
+            return
+        if append and self.search_offset is None:
+            return
             
-            if response and response.get("status") == "success":
-                puzzles = response.get("data", {}).get("puzzles", [])
-                self.puzzle_list["values"] = [f"{p['title']} (by {p['author_name']})" for p in puzzles]
-                if puzzles:
-                    self.puzzle_list.current(0)
-                self.puzzles = puzzles
-            else:
-                messagebox.showerror("Error", response.get("message", "Could not load puzzles"))
-        except Exception as e:
-            messagebox.showerror("Error", f"Could not load puzzles: {str(e)}")
+        payload = {
+            "query": query,
+            "limit": PUZZLE_PAGE_SIZE,
+            "offset": self.search_offset if append else 0
+        }
+        self.requests.submit(
+            'puzzles',
+            lambda: self.puzzle_client.send_request("search_puzzles", payload),
+            lambda response: self.finish_search_puzzles(response, append),
+            lambda e: messagebox.showerror("Error", f"Could not search puzzles: {str(e)}")
+        )
+    
+    def finish_search_puzzles(self, response, append):
+        if response and response.get("status") == "success":
+            data = response.get("data", {})
+            self.puzzle_cursor = None
+            self.search_offset = data.get("next_offset")
+            self.show_puzzles(data.get("puzzles", []), append, self.search_offset is not None)
+        else:
+            messagebox.showerror("Error", (response or {}).get("message", "Could not search puzzles"))
+    
+    def load_more_puzzles(self):
+        # Continue whichever listing is showing: search results or the filtered list
+        if self.search_offset is not None:
+            self.search_puzzles(append=True)
+        else:
+            self.load_puzzles(append=True)
+    
+    def show_puzzles(self, puzzles, append, has_more):
+        self.puzzles = self.puzzles + puzzles if append else puzzles
+        self.more_button.config(state='normal' if has_more else 'disabled')
+        self.puzzle_list["values"] = [f"{p['title']} (by {p['author_name']})" for p in self.puzzles]
+        if puzzles and not append:
+            self.puzzle_list.current(0)
+        elif not self.puzzles:
+            self.puzzle_list.set('')
     
     def load_selected_puzzle(self):
         if not self.current_user:
@@ -364,53 +551,49 @@ class PuzzleClient:
             selected_puzzle = self.puzzles[selected_index]
             puzzle_id = selected_puzzle['id']
             
-            print(f"[DEBUG] Loading puzzle - ID: {puzzle_id}")
-            response = self.puzzle_client.send_request("get_puzzle", {"puzzle_id": puzzle_id})
+            cached = self.puzzle_cache.get(puzzle_id, selected_puzzle.get('content_hash'))
+            if cached is not None:
+                print(f"[DEBUG] Loading puzzle from cache - ID: {puzzle_id}")
+                # A load still in flight for an earlier selection must not replace this one
+                self.requests.cancel('puzzle')
+                # solved_count is the only field that changes after creation
+                self.current_puzzle = dict(cached, solved_count=selected_puzzle.get('solved_count', 0))
+                self.start_time = None
+                self.display_puzzle()
+                return
             
-            if response and response.get("status") == "success":
-                self.current_puzzle = response.get("data", {}).get("puzzle")
-                if self.current_puzzle:
-                    # Reset start time before displaying puzzle
-                    self.start_time = None
-                    self.display_puzzle()
-                else:
-                    messagebox.showerror("Error", "Could not load puzzle data")
-            else:
-                messagebox.showerror("Error", response.get("message", "Could not load puzzle"))
+            print(f"[DEBUG] Loading puzzle - ID: {puzzle_id}")
+            self.requests.submit(
+                'puzzle',
+                lambda: self.puzzle_client.send_request("get_puzzle", {"puzzle_id": puzzle_id}),
+                self.finish_load_puzzle,
+                lambda e: self.show_request_error("Could not load puzzle", e)
+            )
         except Exception as e:
             print(f"[ERROR] Failed to load puzzle: {str(e)}")
             messagebox.showerror("Error", f"Could not load puzzle: {str(e)}")
     
+    def finish_load_puzzle(self, response):
+        if response and response.get("status") == "success":
+            puzzle = response.get("data", {}).get("puzzle")
+            if puzzle:
+                self.current_puzzle = puzzle
+                self.puzzle_cache.put(self.current_puzzle)
+                # Reset start time before displaying puzzle
+                self.start_time = None
+                self.display_puzzle()
+            else:
+                messagebox.showerror("Error", "Could not load puzzle data")
+        else:
+            messagebox.showerror("Error", (response or {}).get("message", "Could not load puzzle"))
+    
     def display_puzzle(self):
-        # Clear existing grid
-        for widget in self.grid_frame.winfo_children():
-            widget.destroy()
-        self.grid_entries = []
-        
         # Start timing when puzzle is displayed
         self.start_time = time.time()
         print(f"[DEBUG] Starting puzzle timer at: {self.start_time}")
         
-        # Create grid
-        grid = self.current_puzzle['grid']
-        for i, row in enumerate(grid):
-            grid_row = []
-            for j, cell in enumerate(row):
-                if cell == '#':  # Black square
-                    entry = ttk.Entry(self.grid_frame, width=3, justify='center')
-                    entry.insert(0, '#')
-                    entry.configure(state='disabled')
-                    entry.grid(row=i, column=j, padx=1, pady=1)
-                    grid_row.append(entry)
-                else:  # White square
-                    entry = ttk.Entry(self.grid_frame, width=3, justify='center')
-                    entry.grid(row=i, column=j, padx=1, pady=1)
-                    # Start timing when user first types in a cell
-                    entry.bind('<Key>', lambda e, entry=entry: self.handle_first_input(e, entry))
-                    # Bind key event for navigation
-                    entry.bind('<KeyRelease>', lambda e, row=i, col=j: self.handle_key_event(e, row, col))
-                    grid_row.append(entry)
-            self.grid_entries.append(grid_row)
+        # Cells are canvas items, so loading does not create a widget per cell
+        self.puzzle_grid.load(self.current_puzzle['grid'])
         
         # Display clues
         for widget in self.clues_frame.winfo_children():
@@ -446,68 +629,23 @@ class PuzzleClient:
         self.clues_frame.grid_columnconfigure(0, weight=1)
         self.clues_frame.grid_columnconfigure(1, weight=1)
     
-    def handle_first_input(self, event, entry):
+    def handle_first_input(self):
         """Start timing when user first types in any cell"""
         if self.start_time is None:
             self.start_time = time.time()
             print(f"[DEBUG] Starting puzzle timer on first input at: {self.start_time}")
-        # Remove the binding after first input
-        entry.unbind('<Key>')
-    
-    def handle_key_event(self, event, current_row, current_col):
-        """Handle key events, automatically move to next available cell after input"""
-        if len(event.widget.get()) == 1:  # If a character is input
-            # Get grid dimensions
-            rows = len(self.grid_entries)
-            cols = len(self.grid_entries[0])
-            
-            # Try to move to next available cell
-            next_row, next_col = current_row, current_col + 1  # Default move right
-            
-            # If reach end of row, move to start of next row
-            if next_col >= cols:
-                next_row = current_row + 1
-                next_col = 0
-            
-            # If reach last row, go back to first row
-            if next_row >= rows:
-                next_row = 0
-            
-            # Find next available cell
-            while (next_row < rows and 
-                   self.grid_entries[next_row][next_col].cget('state') == 'disabled'):
-                next_col += 1
-                if next_col >= cols:
-                    next_row += 1
-                    next_col = 0
-                if next_row >= rows:
-                    next_row = 0
-            
-            # If found available cell, move focus there
-            if next_row < rows and next_col < cols:
-                self.grid_entries[next_row][next_col].focus()
     
     def submit_solution(self):
-        if not self.current_puzzle or not self.grid_entries:
+        if not self.current_puzzle or not self.puzzle_grid.rows:
             return
             
         try:
-            # Collect answers
-            grid = []
+            # Collect answers ('#' for black squares)
+            grid = self.puzzle_grid.get_letters()
             original_grid = self.current_puzzle['grid']
-            
-            for i, row in enumerate(self.grid_entries):
-                grid_row = []
-                for j, entry in enumerate(row):
-                    if original_grid[i][j] == '#':
-                        grid_row.append('#')
-                    else:
-                        value = entry.get().strip().upper()
-                        if not value:  # If cell is empty
-                            messagebox.showwarning("Warning", "Please fill in all squares before submitting")
-                            return
-                        grid_row.append(value)
-                grid.append(grid_row)
+            if any(not value for row in grid for value in row):  # If a cell is empty
+                messagebox.showwarning("Warning", "Please fill in all squares before submitting")
+                return
             
             # Verify grid size
             if len(grid) != len(original_grid) or any(len(row) != len(original_grid[0]) for row in grid):
@@ -527,27 +665,37 @@ class PuzzleClient:
             print(f"[DEBUG] Submitted grid: {json.dumps(grid)}")
             print(f"[DEBUG] Time taken: {time_taken}")
             
-            response = self.puzzle_client.send_request("submit_solution", {
+            payload = {
                 "puzzle_id": self.current_puzzle['id'],
                 "grid": grid,
                 "time_taken": time_taken
-            })
-            
-            if response and response.get("status") == "success":
-                result = response.get("data", {})
-                if result.get("is_correct"):
-                    messagebox.showinfo("Success", f"{result.get('message', 'Correct!')} Time: {time_taken}s")
-                    self.start_time = None  # Reset start time after successful submission
-                    self.update_statistics()
-                    self.update_leaderboard()
-                    self.update_activity()
-                else:
-                    messagebox.showwarning("Wrong", result.get("message", "Try again!"))
-            else:
-                messagebox.showerror("Error", response.get("message", "Could not submit solution"))
+            }
+            # A second click while the first submission is in flight is ignored
+            self.requests.submit(
+                'submit',
+                lambda: self.puzzle_client.send_request("submit_solution", payload),
+                lambda response: self.finish_submit_solution(response, time_taken),
+                lambda e: self.show_request_error("Could not submit answer", e),
+                supersede=False
+            )
         except Exception as e:
             print(f"[ERROR] Failed to submit answer: {str(e)}")
             messagebox.showerror("Error", f"Could not submit answer: {str(e)}")
+    
+    def finish_submit_solution(self, response, time_taken):
+        if response and response.get("status") == "success":
+            result = response.get("data", {})
+            if result.get("is_correct"):
+                messagebox.showinfo("Success", f"{result.get('message', 'Correct!')} Time: {time_taken}s")
+                self.start_time = None  # Reset start time after successful submission
+                self.update_statistics()
+                if not (self.subscription and self.subscription.connected):
+                    self.update_leaderboard()
+                    self.update_activity()
+            else:
+                messagebox.showwarning("Wrong", result.get("message", "Try again!"))
+        else:
+            messagebox.showerror("Error", (response or {}).get("message", "Could not submit solution"))
 
     def open_puzzle_creator(self):
         """Open puzzle creator window"""
@@ -562,20 +710,26 @@ class PuzzleClient:
             
             # Add puzzle submission callback
             def submit_puzzle_callback(puzzle_data):
-                try:
-                    print("[DEBUG] Submitting new puzzle:", puzzle_data)
-                    response = self.puzzle_client.send_request("create_puzzle", puzzle_data)
-                    
-                    if response and response.get("status") == "success":
-                        messagebox.showinfo("Success", "Puzzle created successfully!")
+                print("[DEBUG] Submitting new puzzle:", puzzle_data)
+                self.requests.submit(
+                    'create_puzzle',
+                    lambda: self.puzzle_client.send_request("create_puzzle", puzzle_data),
+                    finish_create_puzzle,
+                    lambda e: self.show_request_error("Failed to create puzzle", e),
+                    supersede=False
+                )
+            
+            def finish_create_puzzle(response):
+                if response and response.get("status") == "success":
+                    messagebox.showinfo("Success", "Puzzle created successfully!")
+                    try:
                         creator_window.destroy()
-                        self.load_puzzles()  # Refresh puzzle list
-                    else:
-                        messagebox.showerror("Error", 
-                                           response.get("message", "Failed to create puzzle"))
-                except Exception as e:
-                    print(f"[ERROR] Failed to create puzzle: {str(e)}")
-                    messagebox.showerror("Error", f"Failed to create puzzle: {str(e)}")
+                    except tk.TclError:
+                        pass  # Closed while the request was in flight
+                    self.load_puzzles()  # Refresh puzzle list
+                else:
+                    messagebox.showerror("Error", 
+                                       (response or {}).get("message", "Failed to create puzzle"))
             
             # Set callback function
             creator_window.submit_callback = submit_puzzle_callback
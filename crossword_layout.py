@@ -0,0 +1,86 @@
+from collections import namedtuple
+
+ACROSS = 'A'
+DOWN = 'D'
+
+# One answer slot: a run of two or more white cells starting at (row, col)
+WordSpan = namedtuple('WordSpan', ['number', 'direction', 'row', 'col', 'length'])
+
+class CrosswordLayout:
+    """
+    Word spans of a crossword grid, extracted in a single row-major pass.
+    Standard numbering: a white cell gets the next number if it starts an
+    across word (black or edge to its left, white to its right) or a down
+    word (black or edge above, white below). Runs of one cell are not words.
+
+    layout is a sequence of rows (strings or lists) with '#' for black cells.
+    Attributes:
+      across, down - WordSpans in numbering order
+      numbers      - {(row, col): number} for every numbered cell
+      cell_spans   - [row][col] -> (across index, down index) into across and
+                     down, None where the cell is not part of such a word
+    """
+    def __init__(self, layout):
+        self.rows = len(layout)
+        self.cols = len(layout[0]) if layout else 0
+        self.across = []
+        self.down = []
+        self.numbers = {}
+        self.cell_spans = [[(None, None)] * self.cols for _ in range(self.rows)]
+
+        black = [[cell == '#' for cell in row] for row in layout]
+        down_runs = [None] * self.cols  # Down span index continuing into each column
+        down_lengths = []
+        number = 0
+        for r in range(self.rows):
+            row_black = black[r]
+            below = black[r + 1] if r + 1 < self.rows else None
+            across_run = None
+            spans_row = self.cell_spans[r]
+            for c in range(self.cols):
+                if row_black[c]:
+                    across_run = None
+                    down_runs[c] = None
+                    continue
+                starts_across = (c == 0 or row_black[c - 1]) and c + 1 < self.cols and not row_black[c + 1]
+                starts_down = (r == 0 or black[r - 1][c]) and below is not None and not below[c]
+                if starts_across or starts_down:
+                    number += 1
+                    self.numbers[(r, c)] = number
+                if starts_across:
+                    across_run = len(self.across)
+                    self.across.append([number, r, c, 0])
+                elif c == 0 or row_black[c - 1]:
+                    across_run = None  # Single white cell between blacks
+                if starts_down:
+                    down_runs[c] = len(self.down)
+                    self.down.append([number, r, c])
+                    down_lengths.append(0)
+                elif r == 0 or black[r - 1][c]:
+                    down_runs[c] = None
+                if across_run is not None:
+                    self.across[across_run][3] += 1
+                if down_runs[c] is not None:
+                    down_lengths[down_runs[c]] += 1
+                spans_row[c] = (across_run, down_runs[c])
+
+        self.across = [WordSpan(n, ACROSS, r, c, length) for n, r, c, length in self.across]
+        self.down = [WordSpan(n, DOWN, r, c, length)
+                     for (n, r, c), length in zip(self.down, down_lengths)]
+
+    def spans_at(self, row, col):
+        """Return the (across, down) WordSpans through a cell, None where absent"""
+        across, down = self.cell_spans[row][col]
+        return (self.across[across] if across is not None else None,
+                self.down[down] if down is not None else None)
+
+    def in_word(self, row, col):
+        """True if the cell belongs to an across or down word"""
+        return self.cell_spans[row][col] != (None, None)
+
+    @staticmethod
+    def cells(span):
+        """Return the (row, col) cells of a span"""
+        if span.direction == ACROSS:
+            return [(span.row, span.col + i) for i in range(span.length)]
+        return [(span.row + i, span.col) for i in range(span.length)]
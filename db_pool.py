@@ -0,0 +1,85 @@
+import sqlite3
+import threading
+
+DATABASE = 'DATABASE-puzzles.db'
+
+class ConnectionPool:
+    """
+    Shared pool of long-lived SQLite connections.
+    A thread checks a connection out for the duration of one unit of work and
+    returns it afterwards, so connections are reused across requests instead of
+    being opened (and the schema re-parsed) on every call.
+    """
+    def __init__(self, db_path=DATABASE, max_size=8, busy_timeout_ms=5000, journal_mode='WAL'):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.busy_timeout_ms = busy_timeout_ms
+        self.journal_mode = journal_mode
+
+        self._idle = []
+        self._lock = threading.Lock()
+        self._size = 0      # Connections currently open (idle + in use)
+        self._hits = 0      # Checkouts served by an idle connection
+        self._misses = 0    # Checkouts that had to open a new connection
+
+    def _open_connection(self):
+        """Open and configure a new connection"""
+        # Connections may be checked out by different threads over their
+        # lifetime, but only ever by one thread at a time.
+        conn = sqlite3.connect(self.db_path,
+                               timeout=self.busy_timeout_ms / 1000,
+                               check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if self.journal_mode:
+            # WAL lets readers proceed while a submission write is in progress
+            conn.execute(f"PRAGMA journal_mode = {self.journal_mode}")
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    def acquire(self):
+        """Check a connection out of the pool"""
+        with self._lock:
+            if self._idle:
+                self._hits += 1
+                return self._idle.pop()
+            self._misses += 1
+            self._size += 1
+        try:
+            return self._open_connection()
+        except sqlite3.Error:
+            with self._lock:
+                self._size -= 1
+            raise
+
+    def release(self, conn):
+        """Return a connection to the pool, closing it if the pool is full"""
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append(conn)
+                return
+            self._size -= 1
+        conn.close()
+
+    def stats(self):
+        """Return pool size and hit/miss counters"""
+        with self._lock:
+            checkouts = self._hits + self._misses
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'in_use': self._size - len(self._idle),
+                'max_size': self.max_size,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / checkouts if checkouts else 0.0
+            }
+
+    def close_all(self):
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+        for conn in idle:
+            conn.close()
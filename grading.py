@@ -0,0 +1,55 @@
+from itertools import chain
+from operator import itemgetter
+
+class CompiledSolution:
+    """
+    A puzzle's solution key prepared for repeated grading.
+    The key is flattened once into uppercased cells plus a mask of white-cell
+    positions, so a submission is graded by a few C-level passes (flatten,
+    uppercase, pick white cells, compare) instead of a Python loop per cell.
+    The per-cell diff is only computed when the answer is wrong.
+    """
+    def __init__(self, solution_key):
+        self.rows = len(solution_key)
+        self.cols = len(solution_key[0]) if solution_key else 0
+        # Uppercased expected letter per cell, None for black squares
+        self.key_rows = [[None if cell == '#' else cell.upper() for cell in row] for row in solution_key]
+
+        # The flat mask only lines up with submissions if the key is rectangular
+        self.rectangular = all(len(row) == self.cols for row in solution_key)
+        cells = list(chain.from_iterable(self.key_rows))
+        white = [i for i, cell in enumerate(cells) if cell is not None]
+        self.pick_white = itemgetter(*white) if white else None
+        self.expected = self.pick_white(cells) if white else None
+
+    def grade(self, grid):
+        """
+        Grade a submitted grid. Returns the list of incorrect [row, col] cells
+        (empty when correct), or None if the grid does not match the key's shape.
+        """
+        if len(grid) != self.rows or any(len(row) != self.cols for row in grid):
+            return None
+        if self.pick_white is None:
+            return []
+
+        if self.rectangular:
+            try:
+                cells = list(map(str.upper, chain.from_iterable(grid)))
+                if self.pick_white(cells) == self.expected:
+                    return []
+            except TypeError:
+                pass  # A non-string cell; _diff decides whether it matters
+        return self._diff(grid)
+
+    def _diff(self, grid):
+        """Compare cell by cell and collect the incorrect positions"""
+        incorrect_cells = []
+        try:
+            for i, row in enumerate(grid):
+                for j, cell in enumerate(row):
+                    expected = self.key_rows[i][j]
+                    if expected is not None and cell.upper() != expected:
+                        incorrect_cells.append([i, j])
+        except (AttributeError, IndexError):
+            return None
+        return incorrect_cells
@@ -5,6 +5,7 @@ import traceback
 import sys
 import hashlib
 from datetime import datetime
+from puzzle_text import parse_tags, clue_text
 
 # Define database file path
 DATABASE = 'DATABASE-puzzles.db'
@@ -243,6 +244,16 @@ def init_db():
                 VALUES (?, ?, ?, ?, ?, ?)
             """, (puzzle['title'], puzzle['tags'], puzzle['grid'], 
                   puzzle['clues'], puzzle['solution_key'], test_user_id))
+            puzzle_id = cursor.lastrowid
+            cursor.executemany("""
+                INSERT INTO puzzle_tags (tag, puzzle_id)
+                VALUES (?, ?)
+            """, [(tag, puzzle_id) for tag in parse_tags(puzzle['tags'])])
+            cursor.execute("""
+                INSERT INTO puzzles_fts (rowid, title, tags, clues)
+                VALUES (?, ?, ?, ?)
+            """, (puzzle_id, puzzle['title'], ' '.join(parse_tags(puzzle['tags'])),
+                  clue_text(puzzle['clues'])))
             print(f"Added sample puzzle: {puzzle['title']}")
         
         # Commit changes
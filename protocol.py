@@ -0,0 +1,66 @@
+import socket
+import json
+import time
+
+DEFAULT_MAX_MESSAGE_SIZE = 1024 * 1024  # 1 MiB, well above a 30x30 puzzle payload
+
+class MessageTooLarge(ValueError):
+    """Raised when a peer sends a message longer than the reader's limit"""
+
+class LineReader:
+    """
+    Buffered reader for newline-delimited messages on a socket.
+    Bytes received after a newline are kept for the next call, so several
+    requests sent back to back on one connection are read one at a time.
+    Messages are accumulated as bytes and only scanned once for the newline,
+    so reading a large message costs time linear in its size.
+    """
+    def __init__(self, sock, chunk_size=65536, max_message_size=DEFAULT_MAX_MESSAGE_SIZE):
+        self.sock = sock
+        self.chunk_size = chunk_size
+        self.max_message_size = max_message_size
+        self._buffer = bytearray()
+        self._scanned = 0  # Prefix of the buffer already known to hold no newline
+
+    def readline(self, timeout=None):
+        """
+        Return the next message as bytes without its newline, or None once the
+        peer has closed the connection. Raises socket.timeout if no complete
+        message arrives within timeout seconds, and MessageTooLarge if the
+        message exceeds max_message_size.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        while True:
+            newline = self._buffer.find(b'\n', self._scanned)
+            if newline >= 0:
+                line = bytes(self._buffer[:newline])
+                del self._buffer[:newline + 1]
+                self._scanned = 0
+                return line
+            self._scanned = len(self._buffer)
+            if self.max_message_size and self._scanned > self.max_message_size:
+                raise MessageTooLarge(f"message exceeds {self.max_message_size} bytes")
+
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise socket.timeout("read deadline exceeded")
+                self.sock.settimeout(remaining)
+            chunk = self.sock.recv(self.chunk_size)
+            if not chunk:
+                # Peer closed; hand back any unterminated trailing message
+                if self._buffer:
+                    line = bytes(self._buffer)
+                    self._buffer.clear()
+                    self._scanned = 0
+                    return line
+                return None
+            self._buffer += chunk
+
+def encode_message(message):
+    """Serialize a message as one newline-terminated UTF-8 JSON line"""
+    return (json.dumps(message) + '\n').encode('utf-8')
+
+def send_message(sock, message):
+    """Send a message as one newline-terminated JSON line"""
+    sock.sendall(encode_message(message))
@@ -0,0 +1,148 @@
+import queue
+import threading
+from protocol import encode_message
+
+class PushBroker:
+    """
+    Fans pushed messages out to the connections subscribed to each topic.
+    publish() never blocks: every subscriber buffers its own outgoing
+    messages, and one that falls too far behind is dropped instead of
+    stalling the publisher (the submission writer).
+    """
+    def __init__(self):
+        self._subscribers = {}  # topic -> set of subscribers
+        self._lock = threading.Lock()
+        self._published = 0
+        self._dropped = 0
+
+    def subscribe(self, subscriber, topics):
+        """Add a subscriber to each of the topics"""
+        with self._lock:
+            for topic in topics:
+                self._subscribers.setdefault(topic, set()).add(subscriber)
+                subscriber.topics.add(topic)
+
+    def unsubscribe(self, subscriber, topics=None):
+        """Remove a subscriber from the topics, or from every topic when None"""
+        with self._lock:
+            for topic in list(subscriber.topics if topics is None else topics):
+                self._subscribers.get(topic, set()).discard(subscriber)
+                subscriber.topics.discard(topic)
+
+    def has_subscribers(self, topic):
+        with self._lock:
+            return bool(self._subscribers.get(topic))
+
+    def publish(self, topic, data):
+        """Send {"type": "push", "topic": topic, "data": data} to the topic's subscribers"""
+        with self._lock:
+            subscribers = list(self._subscribers.get(topic, ()))
+        if not subscribers:
+            return
+        payload = encode_message({'type': 'push', 'topic': topic, 'data': data})
+        for subscriber in subscribers:
+            if not subscriber.send(payload):
+                print("[DEBUG] Dropping push subscriber that fell behind or disconnected")
+                self.unsubscribe(subscriber)
+                with self._lock:
+                    self._dropped += 1
+        with self._lock:
+            self._published += 1
+
+    def stats(self):
+        """Return subscriber counts per topic and publish counters"""
+        with self._lock:
+            return {
+                'subscribers': {topic: len(subs) for topic, subs in self._subscribers.items()},
+                'published': self._published,
+                'dropped': self._dropped
+            }
+
+class SocketSubscriber:
+    """
+    Push target for a blocking socket served by its own thread.
+    Messages are queued and written by a sender thread started on the first
+    push, holding write_lock so they never interleave with responses.
+    """
+    def __init__(self, sock, write_lock, max_pending=256):
+        self.sock = sock
+        self.write_lock = write_lock
+        self.topics = set()
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self._sender = None
+        self._start_lock = threading.Lock()
+
+    def send(self, payload):
+        """Queue an encoded message; returns False if the subscriber is gone or too slow"""
+        if self._closed:
+            return False
+        with self._start_lock:
+            if self._sender is None:
+                self._sender = threading.Thread(target=self._run, daemon=True)
+                self._sender.start()
+        try:
+            self._queue.put_nowait(payload)
+            return True
+        except queue.Full:
+            self.close()
+            return False
+
+    def _run(self):
+        while True:
+            payload = self._queue.get()
+            if payload is None or self._closed:
+                return
+            try:
+                with self.write_lock:
+                    self.sock.sendall(payload)
+            except OSError:
+                self._closed = True
+                return
+
+    def close(self):
+        """Stop the sender thread; queued messages are discarded"""
+        self._closed = True
+        try:
+            self._queue.put_nowait(None)
+        except queue.Full:
+            pass  # The sender checks _closed before each write
+
+class StreamSubscriber:
+    """
+    Push target for an asyncio StreamWriter, safe to call from any thread.
+    Writes are handed to the event loop; a client whose unsent output grows
+    past max_buffer bytes is disconnected.
+    """
+    def __init__(self, loop, writer, max_buffer=1024 * 1024):
+        self.loop = loop
+        self.writer = writer
+        self.max_buffer = max_buffer
+        self.topics = set()
+        self._closed = False
+
+    def send(self, payload):
+        if self._closed:
+            return False
+        try:
+            self.loop.call_soon_threadsafe(self._write, payload)
+            return True
+        except RuntimeError:
+            # Event loop already closed
+            self._closed = True
+            return False
+
+    def _write(self, payload):
+        if self._closed or self.writer.is_closing():
+            self._closed = True
+            return
+        if self.writer.transport.get_write_buffer_size() > self.max_buffer:
+            print("[DEBUG] Push subscriber too slow, closing connection")
+            self.close()
+            return
+        self.writer.write(payload)
+
+    def close(self):
+        self._closed = True
+        if not self.writer.is_closing():
+            self.writer.close()
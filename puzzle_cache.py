@@ -0,0 +1,56 @@
+import json
+import os
+from cache import LRUCache
+
+PUZZLE_CACHE_DIR = "puzzle_cache"  # Next to auth_token.txt
+PUZZLE_CACHE_SIZE = 64             # Puzzles kept in memory
+
+class PuzzleCache:
+    """
+    Client-side copies of opened puzzles: an in-memory LRU in front of one
+    JSON file per puzzle on disk, so they survive a client restart.
+    Puzzles are immutable once created; a copy is used only while its
+    content_hash matches the one the server lists for that puzzle.
+    """
+    def __init__(self, directory=PUZZLE_CACHE_DIR, max_entries=PUZZLE_CACHE_SIZE):
+        self.directory = directory
+        self.memory = LRUCache(max_entries)
+
+    def _path(self, puzzle_id):
+        return os.path.join(self.directory, f"{int(puzzle_id)}.json")
+
+    def get(self, puzzle_id, content_hash):
+        """Return the cached puzzle if it matches content_hash, else None"""
+        if not content_hash:
+            return None
+        puzzle = self.memory.get(puzzle_id)
+        if puzzle is None:
+            puzzle = self._load(puzzle_id)
+            if puzzle is not None:
+                self.memory.put(puzzle_id, puzzle)
+        if puzzle is None or puzzle.get('content_hash') != content_hash:
+            return None
+        return puzzle
+
+    def put(self, puzzle):
+        """Store a puzzle fetched from the server"""
+        if not puzzle or not puzzle.get('content_hash'):
+            return
+        self.memory.put(puzzle['id'], puzzle)
+        path = self._path(puzzle['id'])
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write then rename, so a crash never leaves a half-written file
+            with open(path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(puzzle, f)
+            os.replace(path + '.tmp', path)
+        except OSError as e:
+            print(f"[ERROR] Failed to save puzzle {puzzle['id']} to cache: {e}")
+
+    def _load(self, puzzle_id):
+        try:
+            with open(self._path(puzzle_id), 'r', encoding='utf-8') as f:
+                puzzle = json.load(f)
+            return puzzle if isinstance(puzzle, dict) else None
+        except (OSError, ValueError):
+            return None
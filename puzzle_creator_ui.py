@@ -1,5 +1,6 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
+from crossword_layout import CrosswordLayout, ACROSS
 
 class PuzzleCreatorWindow(tk.Toplevel):
     """
@@ -24,6 +25,14 @@ class PuzzleCreatorWindow(tk.Toplevel):
 
         # --- Internal Data Structures ---
         self.grid_state = self._initialize_grid_state()
+        # Answer letters by [row][col] ('' when empty); the canvas only displays them
+        self.letters = self._initialize_letters()
+        # Canvas item ids per cell ([row][col]), filled in by _draw_grid, so a
+        # change reconfigures existing items instead of searching by tag
+        self.cell_items = []
+        self.number_items = []
+        self.letter_items = []
+        self.highlighted_cells = set() # Cells currently drawn as selected
         # clues_data format: { number: {'coords': (r,c), 'A': {'clue':'', 'answer':''}, 'D':{...} }, ...}
         self.clues_data = {}
         self.current_clue_number = 1
@@ -74,6 +83,10 @@ class PuzzleCreatorWindow(tk.Toplevel):
                  for c in range(self.grid_cols)]
                 for r in range(self.grid_rows)]
 
+    def _initialize_letters(self):
+        """Initializes the letter store, one string per cell."""
+        return [[''] * self.grid_cols for _ in range(self.grid_rows)]
+
     def _create_info_widgets(self):
         """Creates widgets for puzzle title, dimensions, etc."""
         ttk.Label(self.info_frame, text="Title:").grid(row=0, column=0, padx=5, pady=2, sticky=tk.W)
@@ -147,135 +160,160 @@ class PuzzleCreatorWindow(tk.Toplevel):
         row = event.y // self.cell_size
 
         if 0 <= row < self.grid_rows and 0 <= col < self.grid_cols:
-            # Check if there's a letter in this position
-            letter_tag = f"letter_{row}_{col}"
-            letter_items = self.grid_canvas.find_withtag(letter_tag)
-            
+            has_letter = bool(self.letters[row][col])
+
             # If turning black and there's a letter, show warning
-            if not self.grid_state[row][col]['is_black'] and letter_items:
+            if not self.grid_state[row][col]['is_black'] and has_letter:
                 if not messagebox.askyesno("Warning", 
                     "This cell contains a letter. Making it black will delete the letter. Continue?"):
                     return
 
-            # Toggle state
+            # Toggle state; a black cell cannot hold a letter
             self.grid_state[row][col]['is_black'] = not self.grid_state[row][col]['is_black']
-            # Clear number if it becomes black
             if self.grid_state[row][col]['is_black']:
-                self.grid_state[row][col]['number'] = 0
-                # Delete letter (if exists)
-                if letter_items:
-                    self.grid_canvas.delete(letter_tag)
+                self._set_letter(row, col, '')
 
-            # Recalculate numbers and update clue structures
-            self._update_clue_numbers()
+            # Renumber from this cell's neighbourhood onwards
+            changed_numbers = self._update_clue_numbers(row, col)
             # Redraw the affected cell
             self._redraw_cell(row, col)
-            # Redraw all numbers (as they might change)
-            self._draw_numbers()
+            # Redraw only the numbers that changed
+            for r, c in changed_numbers:
+                self._draw_number(r, c)
             # Update the clue listbox display
             self._populate_clue_listbox()
             # Clear selection as numbering changed
             self._clear_clue_selection()
 
     def _draw_grid(self):
-        """Draws the entire grid initially."""
+        """Draws the entire grid initially, remembering the canvas items of each cell."""
         self.grid_canvas.delete("all")
+        self.cell_items = [[None] * self.grid_cols for _ in range(self.grid_rows)]
+        self.number_items = [[None] * self.grid_cols for _ in range(self.grid_rows)]
+        self.letter_items = [[None] * self.grid_cols for _ in range(self.grid_rows)]
+        self.highlighted_cells = set()
         for r in range(self.grid_rows):
             for c in range(self.grid_cols):
-                self._redraw_cell(r, c)
+                x1, y1 = c * self.cell_size, r * self.cell_size
+                self.cell_items[r][c] = self.grid_canvas.create_rectangle(
+                    x1, y1, x1 + self.cell_size, y1 + self.cell_size,
+                    fill='black' if self.grid_state[r][c]['is_black'] else 'white',
+                    outline='grey', width=1, tags=self.grid_state[r][c]['tags'])
         self._draw_numbers()
+        for r, letters in enumerate(self.letters):
+            for c, letter in enumerate(letters):
+                if letter:
+                    self._draw_letter(r, c)
 
     def _redraw_cell(self, row, col, is_selected=False):
-        """Draws or redraws a single cell."""
+        """Restyles a single cell's existing canvas items."""
         if not (0 <= row < self.grid_rows and 0 <= col < self.grid_cols): return
 
         cell_data = self.grid_state[row][col]
-        x1, y1 = col * self.cell_size, row * self.cell_size
-        x2, y2 = x1 + self.cell_size, y1 + self.cell_size
-        tag = cell_data['tags']
-
-        # 保存当前单元格中的字母（如果有）
-        letter_tag = f"letter_{row}_{col}"
-        letter_items = self.grid_canvas.find_withtag(letter_tag)
-        letter_text = ""
-        if letter_items:
-            letter_text = self.grid_canvas.itemcget(letter_items[0], "text")
-
-        self.grid_canvas.delete(tag) # Delete previous items for this cell
-
-        fill_color = 'black' if cell_data['is_black'] else 'white'
-        outline_color = self.selected_outline_color if is_selected else 'grey'
-        outline_width = self.selected_outline_width if is_selected else 1
-
-        self.grid_canvas.create_rectangle(x1, y1, x2, y2,
-                                          fill=fill_color,
-                                          outline=outline_color,
-                                          width=outline_width,
-                                          tags=tag)
-
-        # 如果单元格不是黑色且之前有字母，重新显示字母
-        if not cell_data['is_black'] and letter_text:
-            x = col * self.cell_size + self.cell_size/2
-            y = row * self.cell_size + self.cell_size/2
-            self.grid_canvas.create_text(x, y,
-                                       text=letter_text,
-                                       font=('Arial', 14),
-                                       tags=(letter_tag, "answer_letter"))
+        self.grid_canvas.itemconfig(self.cell_items[row][col],
+                                    fill='black' if cell_data['is_black'] else 'white',
+                                    outline=self.selected_outline_color if is_selected else 'grey',
+                                    width=self.selected_outline_width if is_selected else 1)
+
+        if is_selected:
+            # Keep the thick outline above the neighbouring cells, and the
+            # cell's own number and letter above its rectangle
+            self.grid_canvas.tag_raise(self.cell_items[row][col])
+            for item in (self.number_items[row][col], self.letter_items[row][col]):
+                if item is not None:
+                    self.grid_canvas.tag_raise(item)
 
     def _draw_numbers(self):
         """Draws the clue numbers on the grid."""
-        self.grid_canvas.delete("clue_number") # Clear old numbers
         for r in range(self.grid_rows):
             for c in range(self.grid_cols):
-                cell_data = self.grid_state[r][c]
-                if not cell_data['is_black'] and cell_data['number'] > 0:
-                    x1, y1 = c * self.cell_size, r * self.cell_size
-                    self.grid_canvas.create_text(x1 + 3, y1 + 2, # Small offset
-                                                 text=str(cell_data['number']),
-                                                 anchor=tk.NW,
-                                                 font=self.number_font,
-                                                 tags=("clue_number", cell_data['tags'])) # Tag with cell too
+                self._draw_number(r, c)
+
+    def _draw_number(self, row, col):
+        """Creates, updates or removes the clue number item of one cell."""
+        cell_data = self.grid_state[row][col]
+        item = self.number_items[row][col]
+        if not cell_data['is_black'] and cell_data['number'] > 0:
+            if item is None:
+                x1, y1 = col * self.cell_size, row * self.cell_size
+                self.number_items[row][col] = self.grid_canvas.create_text(
+                    x1 + 3, y1 + 2, # Small offset
+                    text=str(cell_data['number']),
+                    anchor=tk.NW,
+                    font=self.number_font,
+                    tags=("clue_number", cell_data['tags'])) # Tag with cell too
+            else:
+                self.grid_canvas.itemconfig(item, text=str(cell_data['number']))
+        elif item is not None:
+            self.grid_canvas.delete(item)
+            self.number_items[row][col] = None
 
     # --- Clue Numbering Logic ---
 
-    def _update_clue_numbers(self):
-        """Recalculates clue numbers based on the current grid state."""
-        # Reset existing numbers and clue data structure
-        self.clues_data = {}
-        for r in range(self.grid_rows):
-            for c in range(self.grid_cols):
-                self.grid_state[r][c]['number'] = 0
+    def _word_starts(self, r, c):
+        """Returns (is_across_start, is_down_start) for a cell."""
+        if self.grid_state[r][c]['is_black']:
+            return False, False
+        is_across_start = (c == 0 or self.grid_state[r][c-1]['is_black']) and \
+                          (c + 1 < self.grid_cols and not self.grid_state[r][c+1]['is_black'])
+        is_down_start = (r == 0 or self.grid_state[r-1][c]['is_black']) and \
+                        (r + 1 < self.grid_rows and not self.grid_state[r+1][c]['is_black'])
+        return is_across_start, is_down_start
+
+    def _update_clue_numbers(self, row=None, col=None):
+        """
+        Recalculates clue numbers based on the current grid state and returns
+        the cells whose number changed.
+        Toggling (row, col) can only change whether it and its four neighbours
+        start a word, so numbering restarts at the earliest of those cells,
+        and clues outside that row and column keep their text and answers.
+        """
+        if row is None:
+            start = 0
+            kept_clues = {}
+        else:
+            start = (row - 1) * self.grid_cols + col if row > 0 else max(0, col - 1)
+            kept_clues = {(clue['coords'], direction): clue[direction]
+                          for clue in self.clues_data.values()
+                          for direction in ('A', 'D') if direction in clue}
 
+        # Numbers are sequential, so continue from the last one before start
         current_number = 1
-        numbered_coords = set() # Track coords that received a number
+        for index in range(start - 1, -1, -1):
+            number = self.grid_state[index // self.grid_cols][index % self.grid_cols]['number']
+            if number:
+                current_number = number + 1
+                break
+
+        changed = set()
+        for index in range(start, self.grid_rows * self.grid_cols):
+            r, c = divmod(index, self.grid_cols)
+            is_across_start, is_down_start = self._word_starts(r, c)
+            number = 0
+            if is_across_start or is_down_start:
+                number = current_number
+                current_number += 1
+            if self.grid_state[r][c]['number'] != number:
+                self.grid_state[r][c]['number'] = number
+                changed.add((r, c))
+        self.current_clue_number = current_number # Store next available number
 
+        # clues_data format: { number: {'coords': (r,c), 'A': {...}, 'D': {...} }, ...}
+        self.clues_data = {}
         for r in range(self.grid_rows):
             for c in range(self.grid_cols):
-                if not self.grid_state[r][c]['is_black']:
-                    # Check if it's a potential start for Across or Down
-                    is_across_start = (c == 0 or self.grid_state[r][c-1]['is_black']) and \
-                                      (c + 1 < self.grid_cols and not self.grid_state[r][c+1]['is_black'])
-                    is_down_start = (r == 0 or self.grid_state[r-1][c]['is_black']) and \
-                                    (r + 1 < self.grid_rows and not self.grid_state[r+1][c]['is_black'])
-
-                    if is_across_start or is_down_start:
-                        # Assign a number if this coordinate hasn't been numbered yet
-                        if (r, c) not in numbered_coords:
-                            self.grid_state[r][c]['number'] = current_number
-                            self.clues_data[current_number] = {'coords': (r, c)} # Store coords
-                            numbered_coords.add((r, c))
-                            current_number += 1
-
-                        # Add entries for potential Across/Down clues for this number
-                        num = self.grid_state[r][c]['number']
-                        if is_across_start:
-                            if 'A' not in self.clues_data[num]:
-                                self.clues_data[num]['A'] = {'clue': '', 'answer': ''}
-                        if is_down_start:
-                             if 'D' not in self.clues_data[num]:
-                                self.clues_data[num]['D'] = {'clue': '', 'answer': ''}
-
-        self.current_clue_number = current_number # Store next available number
+                num = self.grid_state[r][c]['number']
+                if not num:
+                    continue
+                is_across_start, is_down_start = self._word_starts(r, c)
+                self.clues_data[num] = {'coords': (r, c)}
+                if is_across_start:
+                    kept = kept_clues.get(((r, c), 'A')) if r != row else None
+                    self.clues_data[num]['A'] = kept or {'clue': '', 'answer': ''}
+                if is_down_start:
+                    kept = kept_clues.get(((r, c), 'D')) if c != col else None
+                    self.clues_data[num]['D'] = kept or {'clue': '', 'answer': ''}
+        return changed
 
 
     # --- Clue Entry Logic ---
@@ -283,12 +321,14 @@ class PuzzleCreatorWindow(tk.Toplevel):
     def _populate_clue_listbox(self):
         """Updates the listbox with currently available clues."""
         self.clue_listbox.delete(0, tk.END)
-        sorted_numbers = sorted(self.clues_data.keys())
-        for num in sorted_numbers:
+        items = []
+        for num in sorted(self.clues_data.keys()):
             if 'A' in self.clues_data[num]:
-                self.clue_listbox.insert(tk.END, f"{num} Across")
+                items.append(f"{num} Across")
             if 'D' in self.clues_data[num]:
-                self.clue_listbox.insert(tk.END, f"{num} Down")
+                items.append(f"{num} Down")
+        if items:
+            self.clue_listbox.insert(tk.END, *items) # One Tcl call for the whole list
 
     def _on_clue_select(self, event):
         """Handles selection change in the clue listbox."""
@@ -382,47 +422,52 @@ class PuzzleCreatorWindow(tk.Toplevel):
                 r += i
                 
             if 0 <= r < self.grid_rows and 0 <= c < self.grid_cols:
-                # Delete previous letter (if exists)
-                self.grid_canvas.delete(f"letter_{r}_{c}")
-                # Add new letter
-                x = c * self.cell_size + self.cell_size/2
-                y = r * self.cell_size + self.cell_size/2
-                self.grid_canvas.create_text(x, y,
-                                          text=letter,
-                                          font=('Arial', 14),
-                                          tags=(f"letter_{r}_{c}", "answer_letter"))
+                self._set_letter(r, c, letter)
+
+    def _set_letter(self, r, c, letter):
+        """Stores a cell's letter ('' to clear it) and updates its canvas item."""
+        if self.letters[r][c] != letter:
+            self.letters[r][c] = letter
+            self._draw_letter(r, c)
+
+    def _draw_letter(self, r, c):
+        """Creates, updates or removes a cell's letter item to match the letter store."""
+        letter = self.letters[r][c]
+        item = self.letter_items[r][c]
+        if not letter:
+            if item is not None:
+                self.grid_canvas.delete(item)
+                self.letter_items[r][c] = None
+        elif item is not None:
+            self.grid_canvas.itemconfig(item, text=letter)
+        else:
+            x = c * self.cell_size + self.cell_size/2
+            y = r * self.cell_size + self.cell_size/2
+            self.letter_items[r][c] = self.grid_canvas.create_text(
+                x, y,
+                text=letter,
+                font=('Arial', 14),
+                tags=(f"letter_{r}_{c}", "answer_letter"))
 
     def _highlight_selected_clue_cells(self):
         """Highlights the cells on the grid corresponding to the selected clue."""
-        # First, redraw all cells without highlight
-        for r in range(self.grid_rows):
-            for c in range(self.grid_cols):
-                self._redraw_cell(r, c, is_selected=False)
-        self._draw_numbers() # Redraw numbers on top
-
-        if self.selected_clue_num is None or self.selected_clue_dir is None:
-            return # Nothing selected
-
+        cells = set()
         num = self.selected_clue_num
         direction = self.selected_clue_dir
-        if num not in self.clues_data: return
-        r_start, c_start = self.clues_data[num]['coords']
-
-        length = self._get_word_length(num, direction)
-        if length is None: return
-
-        # Highlight the cells
-        for i in range(length):
-            r, c = r_start, c_start
-            if direction == 'A':
-                c += i
-            else: # direction == 'D'
-                r += i
-
-            if 0 <= r < self.grid_rows and 0 <= c < self.grid_cols and not self.grid_state[r][c]['is_black']:
-                 self._redraw_cell(r, c, is_selected=True)
-
-        self._draw_numbers() # Redraw numbers again to ensure they are on top of highlight
+        if num is not None and direction is not None and num in self.clues_data:
+            r_start, c_start = self.clues_data[num]['coords']
+            length = self._get_word_length(num, direction) or 0
+            for i in range(length):
+                r, c = (r_start, c_start + i) if direction == 'A' else (r_start + i, c_start)
+                if 0 <= r < self.grid_rows and 0 <= c < self.grid_cols and not self.grid_state[r][c]['is_black']:
+                    cells.add((r, c))
+
+        # Only cells entering or leaving the highlight are redrawn
+        for r, c in self.highlighted_cells - cells:
+            self._redraw_cell(r, c, is_selected=False)
+        for r, c in cells - self.highlighted_cells:
+            self._redraw_cell(r, c, is_selected=True)
+        self.highlighted_cells = cells
 
 
     # --- Validation ---
@@ -517,15 +562,26 @@ class PuzzleCreatorWindow(tk.Toplevel):
                 print(f"  Down - Clue: {clue_info['D'].get('clue', 'None')}, Answer: {clue_info['D'].get('answer', 'None')}")
 
         # 5. Check clues for each filled position
-        if filled_positions:
-            for r, c in filled_positions:
-                found = False
-                for num, clue_data in self.clues_data.items():
-                    if self._is_position_in_clue(r, c, num, clue_data):
-                        found = True
-                        break
-                if not found:
-                    missing_info.append(f"- Letter at row {r+1} column {c+1} has no corresponding clue")
+        layout = CrosswordLayout(self._convert_grid_state_to_layout())
+        for r, c in filled_positions:
+            if not layout.in_word(r, c):
+                missing_info.append(f"- Letter at row {r+1} column {c+1} has no corresponding clue")
+
+        # 6. The server needs a letter in every white cell, so each white cell
+        # must belong to a word and be filled in
+        unfilled = [(r, c) for r, c in white_cells if not self.letters[r][c] and layout.in_word(r, c)]
+        if unfilled:
+            r, c = unfilled[0]
+            missing_info.append(f"- Letters for {len(unfilled)} white cell(s), first at row {r+1} column {c+1}")
+        isolated = [(r, c) for r, c in white_cells if not layout.in_word(r, c)]
+        if isolated:
+            r, c = isolated[0]
+            missing_info.append(f"- {len(isolated)} white cell(s) outside any word should be black, "
+                                f"first at row {r+1} column {c+1}")
+
+        # 7. At least one word needs a clue
+        if valid_grid and not any(self._package_clues_data().values()):
+            missing_info.append("- At least one clue with its answer")
 
         # If there's missing information, show error message
         if missing_info:
@@ -552,82 +608,31 @@ class PuzzleCreatorWindow(tk.Toplevel):
 
     def _print_grid_state(self):
         """Print current grid state for debugging"""
-        for r in range(self.grid_rows):
-            row = []
-            for c in range(self.grid_cols):
-                if self.grid_state[r][c]['is_black']:
-                    row.append('#')
-                else:
-                    letter_tag = f"letter_{r}_{c}"
-                    letter_items = self.grid_canvas.find_withtag(letter_tag)
-                    if letter_items:
-                        letter = self.grid_canvas.itemcget(letter_items[0], "text")
-                        row.append(letter)
-                    else:
-                        row.append('.')
-            print(''.join(row))
-
-    def _is_position_in_clue(self, r, c, num, clue_data):
-        """Check if the specified position belongs to a clue"""
-        if 'coords' not in clue_data:
-            return False
-            
-        start_r, start_c = clue_data['coords']
-        
-        # Check across clue
-        if 'A' in clue_data:
-            if r == start_r and c >= start_c:
-                length = self._get_word_length(num, 'A')
-                if c < start_c + length:
-                    return True
-                    
-        # Check down clue
-        if 'D' in clue_data:
-            if c == start_c and r >= start_r:
-                length = self._get_word_length(num, 'D')
-                if r < start_r + length:
-                    return True
-                    
-        return False
+        for row in self._solution_rows():
+            print(row)
 
     def _prepare_puzzle_data(self, title):
         """Prepare puzzle data for submission"""
-        # Create solution grid
-        solution_grid = []
-        for r in range(self.grid_rows):
-            row = []
-            for c in range(self.grid_cols):
-                if self.grid_state[r][c]['is_black']:
-                    row.append('#')
-                else:
-                    letter_tag = f"letter_{r}_{c}"
-                    letter_items = self.grid_canvas.find_withtag(letter_tag)
-                    if letter_items:
-                        letter = self.grid_canvas.itemcget(letter_items[0], "text")
-                        row.append(letter)
-                    else:
-                        row.append('.')
-            solution_grid.append(''.join(row))
-
         return {
             "title": title,
             "grid": self._convert_grid_state_to_layout(),
             "clues": self._package_clues_data(),
-            "solution_key": solution_grid,
+            "solution_key": self._solution_rows(),
             "tags": []
         }
 
+    def _solution_rows(self):
+        """Solution grid as strings: '#' for black cells, '.' for empty ones"""
+        return [''.join('#' if self.grid_state[r][c]['is_black'] else (letters[c] or '.')
+                        for c in range(self.grid_cols))
+                for r, letters in enumerate(self.letters)]
+
     def _get_filled_positions(self):
         """Get all positions with filled letters"""
-        filled_positions = []
-        for r in range(self.grid_rows):
-            for c in range(self.grid_cols):
-                if not self.grid_state[r][c]['is_black']:
-                    letter_tag = f"letter_{r}_{c}"
-                    letter_items = self.grid_canvas.find_withtag(letter_tag)
-                    if letter_items:
-                        filled_positions.append((r, c))
-        return filled_positions
+        return [(r, c)
+                for r, letters in enumerate(self.letters)
+                for c, letter in enumerate(letters)
+                if letter and not self.grid_state[r][c]['is_black']]
 
     def _package_clues_data(self):
         """Package filled clues and answers into the required format"""
@@ -637,37 +642,18 @@ class PuzzleCreatorWindow(tk.Toplevel):
             "down": []
         }
         
-        # Get all filled positions
-        filled_positions = self._get_filled_positions()
-        if not filled_positions:
-            return packaged_clues
-
-        # Process clues
+        # Every word through a filled position is listed once, in the order
+        # its first filled cell appears
+        layout = CrosswordLayout(self._convert_grid_state_to_layout())
         processed_clues = set()
-        for r, c in filled_positions:
-            for num, clue_data in self.clues_data.items():
-                for direction in ['A', 'D']:
-                    if direction in clue_data and (num, direction) not in processed_clues:
-                        start_r, start_c = clue_data['coords']
-                        length = self._get_word_length(num, direction)
-                        
-                        # Check if this position belongs to current clue
-                        is_part_of_clue = False
-                        if direction == 'A' and r == start_r and c >= start_c and c < start_c + length:
-                            is_part_of_clue = True
-                        elif direction == 'D' and c == start_c and r >= start_r and r < start_r + length:
-                            is_part_of_clue = True
-                            
-                        if is_part_of_clue:
-                            clue_info = clue_data[direction]
-                            if clue_info.get('clue') and clue_info.get('answer'):
-                                # Add clue to appropriate list
-                                clue_text = f"{clue_info['clue']}"
-                                if direction == 'A':
-                                    packaged_clues['across'].append(clue_text)
-                                else:  # direction == 'D'
-                                    packaged_clues['down'].append(clue_text)
-                                processed_clues.add((num, direction))
+        for r, c in self._get_filled_positions():
+            for span in layout.spans_at(r, c):
+                if span is None or (span.number, span.direction) in processed_clues:
+                    continue
+                processed_clues.add((span.number, span.direction))
+                clue_info = self.clues_data.get(span.number, {}).get(span.direction, {})
+                if clue_info.get('clue') and clue_info.get('answer'):
+                    packaged_clues['across' if span.direction == ACROSS else 'down'].append(f"{clue_info['clue']}")
 
         return packaged_clues
 
@@ -700,9 +686,10 @@ class PuzzleCreatorWindow(tk.Toplevel):
 
             # Re-initialize everything
             self.grid_state = self._initialize_grid_state()
+            self.letters = self._initialize_letters()
             self.clues_data = {}
             self.current_clue_number = 1
-            self._clear_clue_selection()
+            self.highlighted_cells = set() # Those items are deleted by _draw_grid
 
             # Resize canvas
             canvas_width = self.grid_cols * self.cell_size
@@ -718,6 +705,7 @@ class PuzzleCreatorWindow(tk.Toplevel):
             # Redraw and update clues
             self._update_clue_numbers()
             self._draw_grid()
+            self._clear_clue_selection()
             self._populate_clue_listbox()
             self.center_window() # Recenter after resize
 
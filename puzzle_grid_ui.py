@@ -0,0 +1,164 @@
+import tkinter as tk
+
+class PuzzleGrid(tk.Canvas):
+    """
+    Crossword grid for solving, drawn on a single Canvas.
+    Each cell is one rectangle item (plus one text item for white cells)
+    created once per puzzle. Typing and navigation go through one key
+    handler, and only cells whose letter or highlight changed are redrawn.
+    """
+    def __init__(self, parent, cell_size=30, on_first_input=None):
+        super().__init__(parent, bg='white', borderwidth=0, highlightthickness=0, takefocus=1)
+        self.cell_size = cell_size
+        self.letter_font = ('Arial', 14)
+        self.cursor_color = '#cce5ff'
+        self.selected_outline_color = 'blue'
+        self.on_first_input = on_first_input  # Called once, on the first letter typed
+
+        # --- Per-puzzle state, indexed [row][col] ---
+        self.rows = 0
+        self.cols = 0
+        self.black = []
+        self.letters = []
+        self.rect_ids = []
+        self.text_ids = []
+        self.cursor = None      # (row, col) of the cell receiving input
+        self._typed = False
+        self._dirty = set()     # Cells to redraw on the next idle callback
+        self._flush_pending = False
+
+        self.bind("<Button-1>", self._on_click)
+        self.bind("<Key>", self._on_key)
+
+    def load(self, grid):
+        """Replaces the grid with a new puzzle layout ('#' marks black cells)."""
+        self.delete("all")
+        self._dirty.clear()
+        self.rows = len(grid)
+        self.cols = len(grid[0]) if grid else 0
+        self.black = [[cell == '#' for cell in row] for row in grid]
+        self.letters = [[''] * self.cols for _ in range(self.rows)]
+        self.rect_ids = [[None] * self.cols for _ in range(self.rows)]
+        self.text_ids = [[None] * self.cols for _ in range(self.rows)]
+        self._typed = False
+        self.config(width=self.cols * self.cell_size, height=self.rows * self.cell_size)
+
+        size = self.cell_size
+        for r in range(self.rows):
+            for c in range(self.cols):
+                x1, y1 = c * size, r * size
+                self.rect_ids[r][c] = self.create_rectangle(
+                    x1, y1, x1 + size, y1 + size,
+                    fill='black' if self.black[r][c] else 'white', outline='grey')
+                if not self.black[r][c]:
+                    self.text_ids[r][c] = self.create_text(
+                        x1 + size / 2, y1 + size / 2, text='', font=self.letter_font)
+
+        self.cursor = None
+        first = self._next_white(0, -1, 0, 1)
+        if first:
+            self._move_cursor(*first)
+        self.focus_set()
+
+    def get_letters(self):
+        """Returns the grid as rows of letters, '#' for black cells and '' for empty ones."""
+        return [['#' if self.black[r][c] else self.letters[r][c] for c in range(self.cols)]
+                for r in range(self.rows)]
+
+    # --- Input ---
+
+    def _on_click(self, event):
+        """Moves the cursor to the clicked white cell."""
+        self.focus_set()
+        row, col = event.y // self.cell_size, event.x // self.cell_size
+        if 0 <= row < self.rows and 0 <= col < self.cols and not self.black[row][col]:
+            self._move_cursor(row, col)
+
+    def _on_key(self, event):
+        """Single key handler for typing, deleting and arrow navigation."""
+        if self.cursor is None:
+            return
+        row, col = self.cursor
+        arrows = {'Left': (0, -1), 'Right': (0, 1), 'Up': (-1, 0), 'Down': (1, 0)}
+        if event.keysym in arrows:
+            target = self._next_white(row, col, *arrows[event.keysym], wrap=False)
+            if target:
+                self._move_cursor(*target)
+        elif event.keysym == 'BackSpace':
+            if self.letters[row][col]:
+                self._set_letter(row, col, '')
+            else:
+                # Empty cell: step back and clear the previous one
+                target = self._next_white(row, col, 0, -1)
+                if target:
+                    self._move_cursor(*target)
+                    self._set_letter(*target, '')
+        elif event.keysym == 'Delete':
+            self._set_letter(row, col, '')
+        elif len(event.char) == 1 and event.char.isprintable() and not event.char.isspace():
+            if not self._typed:
+                self._typed = True
+                if self.on_first_input:
+                    self.on_first_input()
+            self._set_letter(row, col, event.char.upper())
+            # Move on to the next white cell, reading order, wrapping around
+            target = self._next_white(row, col, 0, 1)
+            if target:
+                self._move_cursor(*target)
+        else:
+            return
+        return "break"
+
+    def _next_white(self, row, col, d_row, d_col, wrap=True):
+        """
+        Finds the next white cell from (row, col) in a direction. With wrap,
+        horizontal steps continue on the next/previous row and around the grid.
+        """
+        for _ in range(self.rows * self.cols):
+            row, col = row + d_row, col + d_col
+            if wrap and d_col:
+                if col >= self.cols:
+                    row, col = (row + 1) % self.rows, 0
+                elif col < 0:
+                    row, col = (row - 1) % self.rows, self.cols - 1
+            if not (0 <= row < self.rows and 0 <= col < self.cols):
+                return None
+            if not self.black[row][col]:
+                return row, col
+        return None
+
+    # --- Drawing ---
+
+    def _set_letter(self, row, col, letter):
+        if self.letters[row][col] != letter:
+            self.letters[row][col] = letter
+            self._mark_dirty(row, col)
+
+    def _move_cursor(self, row, col):
+        if self.cursor is not None:
+            self._mark_dirty(*self.cursor)
+        self.cursor = (row, col)
+        self._mark_dirty(row, col)
+
+    def _mark_dirty(self, row, col):
+        self._dirty.add((row, col))
+        if not self._flush_pending:
+            self._flush_pending = True
+            self.after_idle(self._flush)
+
+    def _flush(self):
+        """Redraws the cells changed since the last flush."""
+        self._flush_pending = False
+        for row, col in self._dirty:
+            if not (0 <= row < self.rows and 0 <= col < self.cols) or self.black[row][col]:
+                continue
+            selected = (row, col) == self.cursor
+            self.itemconfig(self.rect_ids[row][col],
+                            fill=self.cursor_color if selected else 'white',
+                            outline=self.selected_outline_color if selected else 'grey')
+            self.itemconfig(self.text_ids[row][col], text=self.letters[row][col])
+        self._dirty.clear()
+        if self.cursor is not None:
+            # Keep the highlighted outline above the neighbouring cells' outlines
+            self.tag_raise(self.rect_ids[self.cursor[0]][self.cursor[1]])
+            self.tag_raise(self.text_ids[self.cursor[0]][self.cursor[1]])
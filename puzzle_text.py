@@ -0,0 +1,43 @@
+import json
+
+def parse_tags(value):
+    """
+    Normalize tags to a list of distinct lowercase strings. Accepts a list of
+    strings, a comma-separated string, or the JSON list string stored in the
+    puzzles table. Raises ValueError for anything else.
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith('['):
+            try:
+                value = json.loads(text)
+            except ValueError:
+                value = text.strip('[]').split(',')
+        else:
+            value = text.split(',')
+    if not isinstance(value, list) or not all(isinstance(tag, str) for tag in value):
+        raise ValueError("Tags must be a string or a list of strings")
+    tags = []
+    for tag in value:
+        tag = tag.strip().strip('"\'').strip().lower()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+def clue_text(clues):
+    """Flatten a clues object ({'across': [...], 'down': [...]}) into searchable text"""
+    if isinstance(clues, str):
+        try:
+            clues = json.loads(clues)
+        except ValueError:
+            return clues
+    texts = []
+    sections = clues.values() if isinstance(clues, dict) else [clues]
+    for section in sections:
+        for clue in section if isinstance(section, list) else [section]:
+            if isinstance(clue, dict):
+                clue = clue.get('clue') or clue.get('text') or ''
+            texts.append(str(clue))
+    return '\n'.join(texts)
@@ -0,0 +1,85 @@
+from crossword_layout import CrosswordLayout
+
+MAX_GRID_SIZE = 30      # Rows and columns, matching the creator's size limit
+MAX_TITLE_LENGTH = 100
+MAX_CLUE_LENGTH = 300
+MAX_TAGS = 10
+MAX_TAG_LENGTH = 30
+
+def validate_puzzle(title, grid, clues, solution_key, tags=()):
+    """
+    Check a puzzle before it is stored. Returns None if it is acceptable,
+    otherwise a message describing the first problem found.
+
+    grid and solution_key are rows (lists or strings) with '#' for black
+    cells; clues is {'across': [...], 'down': [...]} where a clue is a string
+    or a dict with a 'clue' string. Cheap checks (types, sizes) run first, so
+    an oversized or malformed payload is rejected before any per-cell work;
+    the cell checks are a single pass over the grid.
+    """
+    if not isinstance(title, str) or not title.strip():
+        return "Title must be a non-empty string"
+    if len(title) > MAX_TITLE_LENGTH:
+        return f"Title is longer than {MAX_TITLE_LENGTH} characters"
+
+    if len(tags) > MAX_TAGS:
+        return f"A puzzle can have at most {MAX_TAGS} tags"
+    if any(len(tag) > MAX_TAG_LENGTH for tag in tags):
+        return f"Tags are limited to {MAX_TAG_LENGTH} characters"
+
+    # Shape: rectangular, within limits, and the same for grid and solution
+    if not isinstance(grid, list) or not isinstance(solution_key, list):
+        return "Grid and solution key must be lists of rows"
+    rows = len(grid)
+    if not 1 <= rows <= MAX_GRID_SIZE:
+        return f"Grid must have between 1 and {MAX_GRID_SIZE} rows"
+    if not all(isinstance(row, (list, str)) for row in grid) or \
+       not all(isinstance(row, (list, str)) for row in solution_key):
+        return "Grid and solution key rows must be lists or strings"
+    cols = len(grid[0])
+    if not 1 <= cols <= MAX_GRID_SIZE:
+        return f"Grid must have between 1 and {MAX_GRID_SIZE} columns"
+    if any(len(row) != cols for row in grid):
+        return "Grid rows must all have the same length"
+    if len(solution_key) != rows or any(len(row) != cols for row in solution_key):
+        return f"Solution key must be {rows}x{cols} like the grid"
+
+    # Cells: black squares agree and every white square has a letter
+    for r in range(rows):
+        grid_row = grid[r]
+        solution_row = solution_key[r]
+        for c in range(cols):
+            cell = grid_row[c]
+            answer = solution_row[c]
+            if not isinstance(cell, str) or not isinstance(answer, str):
+                return f"Cell at row {r+1} column {c+1} must be a string"
+            if (cell == '#') != (answer == '#'):
+                return f"Black squares of the grid and solution differ at row {r+1} column {c+1}"
+            if answer != '#' and (len(answer) != 1 or answer == '.' or answer.isspace()):
+                # '.' is how the creator marks a white square left empty
+                return f"Solution needs a single letter at row {r+1} column {c+1}"
+
+    # Words: the grid needs at least one, and no more clues than words
+    layout = CrosswordLayout(grid)
+    if not layout.across and not layout.down:
+        return "Grid has no words (runs of two or more white squares)"
+
+    if not isinstance(clues, dict):
+        return "Clues must be an object with 'across' and 'down' lists"
+    total = 0
+    for direction, spans in (('across', layout.across), ('down', layout.down)):
+        direction_clues = clues.get(direction, [])
+        if not isinstance(direction_clues, list):
+            return f"'{direction}' clues must be a list"
+        if len(direction_clues) > len(spans):
+            return f"{len(direction_clues)} {direction} clues given but the grid has {len(spans)} {direction} words"
+        for clue in direction_clues:
+            text = clue.get('clue') if isinstance(clue, dict) else clue
+            if not isinstance(text, str) or not text.strip():
+                return f"Every {direction} clue needs text"
+            if len(text) > MAX_CLUE_LENGTH:
+                return f"Clues are limited to {MAX_CLUE_LENGTH} characters"
+        total += len(direction_clues)
+    if not total:
+        return "Puzzle needs at least one clue"
+    return None
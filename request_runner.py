@@ -0,0 +1,94 @@
+import itertools
+import queue
+import threading
+
+class RequestRunner:
+    """
+    Runs blocking client requests on worker threads and hands their results
+    back to the Tk thread, which polls for them with root.after.
+
+    Every request has a key naming what it loads ('leaderboard', 'puzzles',
+    ...). A newer request with the same key supersedes the older one: if the
+    older one has not started it is skipped, and if it is already running its
+    result is dropped, so a slow stale response never overwrites a newer one.
+    With supersede=False a request is instead dropped while another with the
+    same key is outstanding (e.g. a second click on Submit).
+
+    submit(), cancel() and the callbacks all run on the Tk thread.
+    """
+    def __init__(self, root, workers=2, poll_ms=50):
+        self.root = root
+        self.poll_ms = poll_ms
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._active = {}  # key -> newest outstanding job
+        self._outstanding = 0
+        self._polling = False
+        self._sequence = itertools.count(1)
+        for i in range(workers):
+            threading.Thread(target=self._work, name=f"request-worker-{i}", daemon=True).start()
+
+    def submit(self, key, func, on_result, on_error=None, supersede=True):
+        """
+        Call func() on a worker thread, then on_result(value) or on_error(exception)
+        on the Tk thread. Returns False if the request was dropped.
+        """
+        current = self._active.get(key)
+        if current is not None:
+            if not supersede:
+                return False
+            current['cancelled'] = True
+        job = {'id': next(self._sequence), 'key': key, 'func': func,
+               'on_result': on_result, 'on_error': on_error, 'cancelled': False}
+        self._active[key] = job
+        self._outstanding += 1
+        self._jobs.put(job)
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self._poll)
+        return True
+
+    def cancel(self, key):
+        """Drop the outstanding request for key, if any"""
+        job = self._active.pop(key, None)
+        if job is not None:
+            job['cancelled'] = True
+
+    def busy(self, key):
+        return key in self._active
+
+    def _work(self):
+        while True:
+            job = self._jobs.get()
+            if job['cancelled']:
+                # Superseded before it started; no network round-trip
+                self._results.put((job, None, None))
+                continue
+            try:
+                self._results.put((job, job['func'](), None))
+            except Exception as e:
+                self._results.put((job, None, e))
+
+    def _poll(self):
+        while True:
+            try:
+                job, value, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._outstanding -= 1
+            if job['cancelled'] or self._active.get(job['key']) is not job:
+                continue
+            del self._active[job['key']]
+            try:
+                if error is None:
+                    job['on_result'](value)
+                elif job['on_error'] is not None:
+                    job['on_error'](error)
+                else:
+                    print(f"[ERROR] Request '{job['key']}' failed: {error}")
+            except Exception as e:
+                print(f"[ERROR] Callback for request '{job['key']}' failed: {e}")
+        if self._outstanding:
+            self.root.after(self.poll_ms, self._poll)
+        else:
+            self._polling = False
@@ -18,6 +18,7 @@ CREATE TABLE IF NOT EXISTS puzzles (
     author_id INTEGER,
     solved_count INTEGER DEFAULT 0,
     last_solved TIMESTAMP,
+    content_hash TEXT,  -- 内容摘要，客户端据此校验本地缓存
     FOREIGN KEY (author_id) REFERENCES users(id)
 );
 
@@ -41,10 +42,52 @@ CREATE TABLE IF NOT EXISTS user_stats (
     puzzles_solved INTEGER DEFAULT 0,
     avg_time REAL DEFAULT 0,
     last_login TIMESTAMP,
+    attempts INTEGER DEFAULT 0,
+    best_time REAL,
+    streak INTEGER DEFAULT 0,
+    best_streak INTEGER DEFAULT 0,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+-- 谜题标签表（每个标签一行，按标签查找谜题）
+CREATE TABLE IF NOT EXISTS puzzle_tags (
+    tag TEXT NOT NULL,
+    puzzle_id INTEGER NOT NULL,
+    PRIMARY KEY (tag, puzzle_id),
+    FOREIGN KEY (puzzle_id) REFERENCES puzzles(id)
+) WITHOUT ROWID;
+
+-- 排行榜表（由 submit_solution 增量维护）
+CREATE TABLE IF NOT EXISTS leaderboard (
+    user_id INTEGER PRIMARY KEY,
+    username TEXT NOT NULL,
+    solved_count INTEGER DEFAULT 0,
+    total_time REAL DEFAULT 0,
+    avg_time REAL,
+    attempts INTEGER DEFAULT 0,
+    accuracy REAL DEFAULT 0,
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
 -- 创建索引
 CREATE INDEX IF NOT EXISTS idx_submissions_user ON submissions(user_id);
 CREATE INDEX IF NOT EXISTS idx_submissions_puzzle ON submissions(puzzle_id);
-CREATE INDEX IF NOT EXISTS idx_puzzles_author ON puzzles(author_id); 
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_submissions_timestamp ON submissions(timestamp);
+CREATE INDEX IF NOT EXISTS idx_puzzles_author ON puzzles(author_id); 
+CREATE INDEX IF NOT EXISTS idx_puzzle_tags_puzzle ON puzzle_tags(puzzle_id);
+-- 谜题列表分页覆盖索引（按排序字段 + id）
+CREATE INDEX IF NOT EXISTS idx_puzzles_list_date ON puzzles(date, id, title, tags, solved_count, author_id, content_hash);
+CREATE INDEX IF NOT EXISTS idx_puzzles_list_title ON puzzles(title, id, tags, date, solved_count, author_id, content_hash);
+CREATE INDEX IF NOT EXISTS idx_puzzles_list_solved ON puzzles(solved_count, id, title, tags, date, author_id, content_hash);
+-- 排行榜覆盖索引（每种排序方式一个）
+CREATE INDEX IF NOT EXISTS idx_leaderboard_solved ON leaderboard(solved_count DESC, avg_time ASC, username, attempts, accuracy);
+CREATE INDEX IF NOT EXISTS idx_leaderboard_fastest ON leaderboard(avg_time ASC, solved_count DESC, username, attempts, accuracy) WHERE solved_count > 0;
+CREATE INDEX IF NOT EXISTS idx_leaderboard_accuracy ON leaderboard(accuracy DESC, attempts DESC, username, solved_count, avg_time);
+
+-- 谜题全文搜索表（rowid 即谜题 id，由 create_puzzle 同步）
+CREATE VIRTUAL TABLE IF NOT EXISTS puzzles_fts USING fts5(
+    title,
+    tags,
+    clues,
+    tokenize = 'unicode61 remove_diacritics 2'
+);
\ No newline at end of file
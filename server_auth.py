@@ -4,8 +4,13 @@ import hashlib
 import time
 import re
 import sqlite3
+import threading
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from protocol import LineReader, MessageTooLarge
 
 DATABASE = 'DATABASE-puzzles.db'
+MAX_REQUEST_SIZE = 64 * 1024
 
 def init_db():
     """Initialize database and create users table"""
@@ -24,7 +29,18 @@ def init_db():
         conn.close()
 
 class SessionManager:
-    def __init__(self):
+    def __init__(self, cache_ttl=60, sweep_interval=60, sweep_batch_size=500):
+        # In-process cache of token -> (user_id, expiry, cached_at).
+        # Entries are re-checked against the database after cache_ttl seconds so
+        # sessions destroyed by another server process are noticed; lookups
+        # with fresh=True (write actions) always go to the database.
+        self.cache_ttl = cache_ttl
+        self.sweep_interval = sweep_interval
+        self.sweep_batch_size = sweep_batch_size
+        self._cache = {}
+        self._cache_lock = threading.Lock()
+        self._stop_event = threading.Event()
+
         # Create sessions table
         try:
             conn = sqlite3.connect(DATABASE)
@@ -34,6 +50,7 @@ class SessionManager:
                         user_id INTEGER NOT NULL,
                         expiry REAL NOT NULL,
                         FOREIGN KEY (user_id) REFERENCES users(id))''')
+            c.execute("CREATE INDEX IF NOT EXISTS idx_sessions_expiry ON sessions(expiry)")
             conn.commit()
         except sqlite3.Error as e:
             print(f"[DB ERROR] Failed to initialize sessions table: {e}")
@@ -41,6 +58,10 @@ class SessionManager:
             if 'conn' in locals():
                 conn.close()
 
+        # Expired rows are deleted in the background instead of on every lookup
+        self._sweeper = threading.Thread(target=self._sweep_loop, daemon=True)
+        self._sweeper.start()
+
     def create_session(self, user_id):
         """Create new session and return token"""
         try:
@@ -58,6 +79,12 @@ class SessionManager:
             c.execute("INSERT INTO sessions (token, user_id, expiry) VALUES (?, ?, ?)",
                      (token, user_id, expiry))
             conn.commit()
+
+            # Write through to the cache
+            with self._cache_lock:
+                for cached_token in [t for t, entry in self._cache.items() if entry[0] == user_id]:
+                    del self._cache[cached_token]
+                self._cache[token] = (user_id, expiry, time.time())
             return token
         except sqlite3.Error as e:
             print(f"[DB ERROR] Failed to create session: {e}")
@@ -66,60 +93,63 @@ class SessionManager:
             if 'conn' in locals():
                 conn.close()
 
+    def _lookup(self, token, fresh=False):
+        """Return (user_id, expiry) for a live session, using the cache first unless fresh"""
+        now = time.time()
+        with self._cache_lock:
+            entry = self._cache.get(token)
+            if entry and not fresh:
+                user_id, expiry, cached_at = entry
+                if expiry > now and now - cached_at < self.cache_ttl:
+                    return user_id, expiry
+                del self._cache[token]
+
+        conn = sqlite3.connect(DATABASE)
+        try:
+            c = conn.cursor()
+            c.execute("SELECT user_id, expiry FROM sessions WHERE token = ? AND expiry > ?",
+                     (token, now))
+            row = c.fetchone()
+        finally:
+            conn.close()
+
+        with self._cache_lock:
+            if not row:
+                self._cache.pop(token, None)
+                return None
+            self._cache[token] = (row[0], row[1], now)
+        return row[0], row[1]
+
     def validate_session(self, token):
         """Validate if session token is valid and not expired"""
         if not isinstance(token, str) or len(token) != 64 or not token.isalnum():
             return False
             
         try:
-            conn = sqlite3.connect(DATABASE)
-            c = conn.cursor()
-            
-            # Clean expired sessions
-            c.execute("DELETE FROM sessions WHERE expiry < ?", (time.time(),))
-            
-            # Check if session exists and not expired
-            c.execute("SELECT COUNT(*) FROM sessions WHERE token = ? AND expiry > ?",
-                     (token, time.time()))
-            count = c.fetchone()[0]
-            
-            conn.commit()
-            return count > 0
+            return self._lookup(token) is not None
         except sqlite3.Error as e:
             print(f"[DB ERROR] Failed to validate session: {e}")
             return False
-        finally:
-            if 'conn' in locals():
-                conn.close()
 
-    def get_user_id(self, token):
-        """Get user ID associated with session"""
+    def get_user_id(self, token, fresh=False):
+        """
+        Get user ID associated with session. fresh=True skips the cache, so a
+        session ended by another process (logout, re-login) is refused at once.
+        """
         if not isinstance(token, str) or len(token) != 64 or not token.isalnum():
             return None
             
         try:
-            conn = sqlite3.connect(DATABASE)
-            c = conn.cursor()
-            
-            # Clean expired sessions
-            c.execute("DELETE FROM sessions WHERE expiry < ?", (time.time(),))
-            
-            # Get user ID
-            c.execute("SELECT user_id FROM sessions WHERE token = ? AND expiry > ?",
-                     (token, time.time()))
-            row = c.fetchone()
-            
-            conn.commit()
-            return row[0] if row else None
+            session = self._lookup(token, fresh)
+            return session[0] if session else None
         except sqlite3.Error as e:
             print(f"[DB ERROR] Failed to get user_id: {e}")
             return None
-        finally:
-            if 'conn' in locals():
-                conn.close()
 
     def destroy_session(self, token):
         """Destroy session"""
+        with self._cache_lock:
+            self._cache.pop(token, None)
         try:
             conn = sqlite3.connect(DATABASE)
             c = conn.cursor()
@@ -131,6 +161,42 @@ class SessionManager:
             if 'conn' in locals():
                 conn.close()
 
+    def sweep_expired(self):
+        """Evict expired cache entries and delete expired rows in batches"""
+        now = time.time()
+        with self._cache_lock:
+            for token in [t for t, entry in self._cache.items()
+                          if entry[1] <= now or now - entry[2] >= self.cache_ttl]:
+                del self._cache[token]
+
+        deleted = 0
+        try:
+            conn = sqlite3.connect(DATABASE)
+            c = conn.cursor()
+            while True:
+                # Short transactions so lookups are never blocked for long
+                c.execute("""DELETE FROM sessions WHERE rowid IN (
+                                SELECT rowid FROM sessions WHERE expiry < ? LIMIT ?)""",
+                         (now, self.sweep_batch_size))
+                conn.commit()
+                deleted += c.rowcount
+                if c.rowcount < self.sweep_batch_size:
+                    break
+        except sqlite3.Error as e:
+            print(f"[DB ERROR] Failed to sweep expired sessions: {e}")
+        finally:
+            if 'conn' in locals():
+                conn.close()
+        return deleted
+
+    def _sweep_loop(self):
+        while not self._stop_event.wait(self.sweep_interval):
+            self.sweep_expired()
+
+    def stop(self):
+        """Stop the background sweeper"""
+        self._stop_event.set()
+
 def hash_password(password):
     """Hash password using SHA-256"""
     if isinstance(password, str):
@@ -139,11 +205,11 @@ def hash_password(password):
 
 def make_response(status, message, data=None):
     """Generate standard response format"""
-    return json.dumps({
+    return {
         "status": status,
         "message": message,
         "data": data or {}
-    })
+    }
 
 def is_valid_username(username):
     """Validate username (alphanumeric, 3-20 characters)"""
@@ -163,8 +229,10 @@ def handle_login(username, password):
             print(f"[DEBUG] Found user - ID: {row[0]}, Stored Hash: {row[1]}")
         if row and row[1] == password_hash:  # Compare hash values
             # Update last login time
-            c.execute('''INSERT OR REPLACE INTO user_stats (user_id, last_login)
-                        VALUES (?, CURRENT_TIMESTAMP)''', (row[0],))
+            # Upsert so an existing stats row keeps its counters
+            c.execute('''INSERT INTO user_stats (user_id, last_login)
+                        VALUES (?, CURRENT_TIMESTAMP)
+                        ON CONFLICT(user_id) DO UPDATE SET last_login = excluded.last_login''', (row[0],))
             conn.commit()
             return row[0]  # Return user ID
         return None
@@ -174,9 +242,9 @@ def handle_login(username, password):
     finally:
         conn.close()
 
-def handle_client_request(data, session_manager):
+def handle_action(request, session_manager):
+    """Handle one decoded request and return the response dict"""
     try:
-        request = json.loads(data)
         action = request.get("action")
         payload = request.get("payload", {})
         token = request.get("auth_token")
@@ -203,6 +271,9 @@ def handle_client_request(data, session_manager):
                          (username, password_hash))
                 user_id = c.lastrowid
                 c.execute("INSERT INTO user_stats (user_id) VALUES (?)", (user_id,))
+                # Zero row so the new user is ranked before their first submission
+                c.execute("INSERT OR IGNORE INTO leaderboard (user_id, username) VALUES (?, ?)",
+                         (user_id, username))
                 conn.commit()
                 return make_response("success", "Registration successful")
             except sqlite3.IntegrityError:
@@ -237,51 +308,103 @@ def handle_client_request(data, session_manager):
         else:
             return make_response("error", "Unknown operation")
 
-    except json.JSONDecodeError:
-        return make_response("error", "Invalid request format")
     except Exception as e:
         return make_response("error", f"Error processing request: {str(e)}")
 
-def recv_until_newline(sock):
-    """Receive data from socket until newline"""
-    buffer = ''
+def handle_client_request(data, session_manager):
+    """
+    Handle one raw request. Returns (response_json, keep_alive); the optional
+    request_id is echoed back so pipelined responses can be matched.
+    """
     try:
-        while True:
-            chunk = sock.recv(4096).decode('utf-8')
-            if not chunk:
-                break
-            buffer += chunk
-            if '\n' in buffer:
-                break
-        return buffer.strip()
-    except (ConnectionResetError, OSError) as e:
-        print(f"[SOCKET ERROR] Error receiving data: {e}")
-        return ''
-
-def start_server(host, port):
-    """Start server and handle client connections"""
+        request = json.loads(data)
+    except json.JSONDecodeError:
+        return json.dumps(make_response("error", "Invalid request format")), False
+    if not isinstance(request, dict):
+        return json.dumps(make_response("error", "Invalid request format")), False
+
+    response = handle_action(request, session_manager)
+    if "request_id" in request:
+        response["request_id"] = request["request_id"]
+    return json.dumps(response), bool(request.get("keep_alive"))
+
+def handle_connection(client_socket, client_address, session_manager, read_timeout):
+    """Serve requests on one client connection until keep-alive ends"""
+    # Auth requests are tiny; anything bigger than this is not a real client
+    reader = LineReader(client_socket, max_message_size=MAX_REQUEST_SIZE)
+    with client_socket:
+        try:
+            print(f"Connection from {client_address}")
+            while True:
+                # Bound the whole read, not just each recv, so a client trickling
+                # bytes (or idling on a keep-alive connection) cannot hold a handler
+                data = reader.readline(timeout=read_timeout)
+                if data is None:
+                    return
+                data = data.decode('utf-8', errors='replace').strip()
+                if not data:
+                    continue
+                print(f"Received request: {data}")
+                response, keep_alive = handle_client_request(data, session_manager)
+                client_socket.settimeout(read_timeout)
+                client_socket.sendall((response + '\n').encode('utf-8'))
+                if not keep_alive:
+                    return
+        except MessageTooLarge as e:
+            print(f"[SOCKET ERROR] {e} from {client_address}")
+        except socket.timeout:
+            print(f"[SOCKET ERROR] Read timed out for {client_address}")
+        except (ConnectionResetError, OSError) as e:
+            print(f"[SOCKET ERROR] Error receiving data: {e}")
+        except Exception as e:
+            print(f"[SERVER ERROR] Error handling client request: {e}")
+
+def start_server(host, port, max_workers=16, max_pending=64, read_timeout=10):
+    """
+    Start server and handle client connections.
+    Connections are served by a pool of max_workers threads; up to max_pending
+    may be queued or running at once, beyond which new clients are turned away
+    immediately instead of stalling the accept loop.
+    """
     init_db()  # Initialize database
     session_manager = SessionManager()
+    slots = threading.BoundedSemaphore(max_pending)
+
+    def serve(client_socket, client_address):
+        try:
+            handle_connection(client_socket, client_address, session_manager, read_timeout)
+        finally:
+            slots.release()
 
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_socket:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server_socket, \
+            ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='auth') as executor:
         server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         server_socket.bind((host, port))
-        server_socket.listen(5)
+        server_socket.listen(max_pending)
         print(f"Server listening on {host}:{port}...")
 
         while True:
             try:
                 client_socket, client_address = server_socket.accept()
-                with client_socket:
-                    print(f"Connection from {client_address}")
-                    data = recv_until_newline(client_socket)
-                    if not data:
-                        continue
-                    print(f"Received request: {data}")
-                    response = handle_client_request(data, session_manager)
-                    client_socket.sendall((response + '\n').encode('utf-8'))
+                if not slots.acquire(blocking=False):
+                    print(f"[SERVER ERROR] Too many pending connections, rejecting {client_address}")
+                    with client_socket:
+                        client_socket.settimeout(1)
+                        client_socket.sendall((json.dumps(make_response("error", "Server busy, please try again")) + '\n').encode('utf-8'))
+                    continue
+                executor.submit(serve, client_socket, client_address)
             except Exception as e:
                 print(f"[SERVER ERROR] Error handling client request: {e}")
 
 if __name__ == "__main__":
-    start_server("localhost", 5000)
+    parser = argparse.ArgumentParser(description="Crossword authentication server")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=5000)
+    parser.add_argument('--workers', type=int, default=16, help="concurrent connection handlers")
+    parser.add_argument('--max-pending', type=int, default=64,
+                        help="connections queued or in progress before new ones are rejected")
+    parser.add_argument('--read-timeout', type=float, default=10,
+                        help="seconds a client has to send its request")
+    args = parser.parse_args()
+    start_server(args.host, args.port, max_workers=args.workers,
+                 max_pending=args.max_pending, read_timeout=args.read_timeout)
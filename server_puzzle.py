@@ -2,19 +2,117 @@ import socket
 import json
 import sqlite3
 import threading
+import asyncio
+import signal
+import argparse
+import base64
+import hashlib
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from server_auth import SessionManager
+from db_pool import ConnectionPool
+from cache import LRUCache, ResourceVersions
+from grading import CompiledSolution
+from puzzle_validation import validate_puzzle
+from puzzle_text import parse_tags, clue_text
+from submission_writer import SubmissionWriter, DURABILITY_MODES
+from activity import ActivityFeed
+from push import PushBroker, SocketSubscriber, StreamSubscriber
+from protocol import LineReader, MessageTooLarge, DEFAULT_MAX_MESSAGE_SIZE, encode_message, send_message
 
 DATABASE = 'DATABASE-puzzles.db'
+SCHEMA_FILE = 'schema.sql'
+KEEP_ALIVE_TIMEOUT = 60  # Seconds an idle keep-alive connection is held open
+LIST_CACHE_SIZE = 64     # Distinct (sort_by, order, tag) puzzle lists kept
+LIST_CACHE_TTL = 300     # Seconds before a cached puzzle list is rebuilt anyway
+DEFAULT_PAGE_SIZE = 50   # Puzzle summaries per page
+MAX_PAGE_SIZE = 200
+MAX_SEARCH_TERMS = 16
+SOLUTION_CACHE_SIZE = 256  # Compiled solution keys kept in memory
+ACTIVITY_FEED_SIZE = 100  # Recent submissions kept in memory
+LEADERBOARD_TOPIC = 'leaderboard'
+SUBSCRIBE_TOPICS = {ActivityFeed.TOPIC, LEADERBOARD_TOPIC}
+# Actions that change data check the session in the database, not the cache
+WRITE_ACTIONS = {'submit_solution', 'create_puzzle'}
+# Resource whose version guards each conditional (if_version) read
+VERSIONED_ACTIONS = {
+    'get_puzzles': 'puzzles',
+    'search_puzzles': 'puzzles',
+    'get_puzzle': 'puzzles',
+    'get_leaderboard': 'leaderboard',
+    'get_recent_activity': 'activity',
+    'get_stats': 'stats'
+}
+# Columns added to user_stats after the original schema, with their definitions
+USER_STATS_MIGRATIONS = {
+    'attempts': 'INTEGER DEFAULT 0',
+    'best_time': 'REAL',
+    'streak': 'INTEGER DEFAULT 0',
+    'best_streak': 'INTEGER DEFAULT 0'
+}
+PUZZLE_MIGRATIONS = {
+    'content_hash': 'TEXT'
+}
+# Index statements in schema.sql; SQLite stores them without IF NOT EXISTS
+SCHEMA_INDEX = re.compile(r"CREATE INDEX IF NOT EXISTS (\w+) (ON [^;]+);")
+
+def tag_filter(tags, mode='all'):
+    """
+    Build a WHERE condition restricting p.id to puzzles carrying the tags.
+    mode 'all' requires every tag, 'any' at least one. The lookup goes through
+    the puzzle_tags primary key, so it costs the number of matches rather than
+    the catalogue size.
+    """
+    placeholders = ', '.join('?' for _ in tags)
+    if mode == 'any' or len(tags) == 1:
+        return f"p.id IN (SELECT puzzle_id FROM puzzle_tags WHERE tag IN ({placeholders}))", list(tags)
+    return (f"p.id IN (SELECT puzzle_id FROM puzzle_tags WHERE tag IN ({placeholders}) "
+            f"GROUP BY puzzle_id HAVING COUNT(*) = ?)", [*tags, len(tags)])
+
+def content_hash(title, grid, clues, solution_key, tags, author_id):
+    """
+    Digest of a puzzle's stored (serialized) content. Puzzles never change
+    after creation, so clients can keep a copy for as long as this matches.
+    """
+    digest = hashlib.sha256()
+    for column in (title, grid, clues, solution_key, tags, author_id):
+        digest.update(str(column).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+def fts_query(text):
+    """
+    Turn free text into a safe FTS5 query: each word becomes a quoted prefix
+    term and all terms must match. Returns None if there are no words.
+    """
+    words = re.findall(r'\w+', str(text or ''))[:MAX_SEARCH_TERMS]
+    if not words:
+        return None
+    return ' '.join(f'"{word}"*' for word in words)
 
 class PuzzleManager:
-    def __init__(self, db_path='DATABASE-puzzles.db'):
-        self.db_path = db_path
+    def __init__(self, pool, list_cache=None, versions=None):
+        self.pool = pool
+        # get_puzzle_list results keyed by (sort_by, order, tag)
+        self.list_cache = list_cache if list_cache is not None else LRUCache(LIST_CACHE_SIZE, LIST_CACHE_TTL)
+        # Bumped with every change to the puzzle catalogue
+        self.versions = versions if versions is not None else ResourceVersions()
 
-    def get_puzzle_list(self, sort_by='date', order='desc', tag=None):
+    def get_puzzle_list(self, sort_by='date', order='desc', tag=None, tag_mode='all'):
         print(f"[DEBUG] Getting puzzle list parameters: sort_by={sort_by}, order={order}, tag={tag}")
+        order = 'asc' if str(order).lower() == 'asc' else 'desc'
+        tags = tuple(parse_tags(tag))
+        tag_mode = 'any' if tag_mode == 'any' else 'all'
+        cache_key = (sort_by, order, tags, tag_mode)
+        puzzles = self.list_cache.get(cache_key)
+        if puzzles is not None:
+            print(f"[DEBUG] Puzzle list served from cache ({len(puzzles)} puzzles)")
+            return puzzles
+        generation = self.list_cache.generation
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.acquire()
             cursor = conn.cursor()
             
             # Convert sorting fields
@@ -25,16 +123,17 @@ class PuzzleManager:
             }
             sort_field = sort_mapping.get(sort_by, 'p.date')
             
-            if tag:
+            if tags:
+                condition, params = tag_filter(tags, tag_mode)
                 query = """
                     SELECT p.id, p.title, p.grid, p.clues, p.tags, p.author_id, p.date, p.solved_count,
                            u.username as author_name
                     FROM puzzles p
                     LEFT JOIN users u ON p.author_id = u.id
-                    WHERE p.tags LIKE ?
+                    WHERE {}
                     ORDER BY {} {}
-                """.format(sort_field, order)
-                cursor.execute(query, (f"%{tag}%",))
+                """.format(condition, sort_field, order)
+                cursor.execute(query, params)
             else:
                 query = """
                     SELECT p.id, p.title, p.grid, p.clues, p.tags, p.author_id, p.date, p.solved_count,
@@ -52,7 +151,7 @@ class PuzzleManager:
                     'title': row[1],
                     'grid': json.loads(row[2]),
                     'clues': json.loads(row[3]),
-                    'tags': row[4].split(',') if row[4] else [],
+                    'tags': parse_tags(row[4]),
                     'author_id': row[5],
                     'date': row[6],
                     'solved_count': row[7],
@@ -61,6 +160,7 @@ class PuzzleManager:
                 puzzles.append(puzzle)
             
             print(f"[DEBUG] Found {len(puzzles)} puzzles")
+            self.list_cache.put(cache_key, puzzles, generation)
             return puzzles
             
         except Exception as e:
@@ -68,16 +168,155 @@ class PuzzleManager:
             return []
         finally:
             if 'conn' in locals():
-                conn.close()
+                self.pool.release(conn)
+
+    def get_puzzle_summaries(self, sort_by='date', order='desc', tag=None, limit=DEFAULT_PAGE_SIZE, cursor=None,
+                             tag_mode='all'):
+        """
+        Return one page of PuzzleListItemObject summaries, without grids or clues.
+        Pages are addressed by a keyset cursor over (sort column, id), so each page
+        is a range scan of a covering index regardless of how deep it is.
+        """
+        sort_mapping = {
+            'date': 'p.date',
+            'title': 'p.title',
+            'solved_count': 'p.solved_count'
+        }
+        sort_field = sort_mapping.get(sort_by, 'p.date')
+        sort_by = sort_by if sort_by in sort_mapping else 'date'
+        order = 'asc' if str(order).lower() == 'asc' else 'desc'
+        tags = tuple(parse_tags(tag))
+        tag_mode = 'any' if tag_mode == 'any' else 'all'
+        try:
+            limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+            after = self._decode_cursor(cursor) if cursor else None
+        except (TypeError, ValueError):
+            return {'status': 'error', 'message': 'Bad limit or cursor'}
+        
+        cache_key = ('summary', sort_by, order, tags, tag_mode, limit, cursor)
+        response = self.list_cache.get(cache_key)
+        if response is not None:
+            return response
+        generation = self.list_cache.generation
+        
+        conditions = []
+        params = []
+        if tags:
+            condition, tag_params = tag_filter(tags, tag_mode)
+            conditions.append(condition)
+            params.extend(tag_params)
+        if after is not None:
+            conditions.append(f"({sort_field}, p.id) {'>' if order == 'asc' else '<'} (?, ?)")
+            params.extend(after)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
+        try:
+            conn = self.pool.acquire()
+            db_cursor = conn.cursor()
+            # Fetch one extra row to learn whether another page follows
+            db_cursor.execute(f"""
+                SELECT p.id, p.title, p.tags, p.date, p.solved_count, u.username, p.content_hash
+                FROM puzzles p
+                LEFT JOIN users u ON p.author_id = u.id
+                {where}
+                ORDER BY {sort_field} {order}, p.id {order}
+                LIMIT ?
+            """, (*params, limit + 1))
+            rows = db_cursor.fetchall()
+            
+            puzzles = [self._summary_from_row(row) for row in rows[:limit]]
+            
+            next_cursor = None
+            if len(rows) > limit:
+                last = puzzles[-1]
+                next_cursor = self._encode_cursor(last[sort_by], last['id'])
+            
+            response = {'status': 'success', 'data': {'puzzles': puzzles, 'next_cursor': next_cursor}}
+            self.list_cache.put(cache_key, response, generation)
+            return response
+            
+        except Exception as e:
+            print(f"[ERROR] Failed to get puzzle summaries: {e}")
+            return {'status': 'error', 'message': 'Failed to retrieve puzzle list'}
+        finally:
+            if 'conn' in locals():
+                self.pool.release(conn)
+
+    @staticmethod
+    def _summary_from_row(row):
+        """Build a PuzzleListItemObject from (id, title, tags, date, solved_count, author, content_hash)"""
+        return {
+            'id': row[0],
+            'title': row[1],
+            'tags': parse_tags(row[2]),
+            'date': row[3],
+            'solved_count': row[4],
+            'author': row[5],
+            'author_name': row[5],
+            'content_hash': row[6]
+        }
+
+    def search_puzzles(self, query, limit=DEFAULT_PAGE_SIZE, offset=0):
+        """
+        Full-text search over titles, tags and clue text, best matches first.
+        Ranking uses bm25 with title hits weighted above tag and clue hits.
+        """
+        match = fts_query(query)
+        if match is None:
+            return {'status': 'error', 'message': 'Search query is empty'}
+        try:
+            limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+            offset = max(0, int(offset))
+        except (TypeError, ValueError):
+            return {'status': 'error', 'message': 'Bad limit or offset'}
+        
+        try:
+            conn = self.pool.acquire()
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT p.id, p.title, p.tags, p.date, p.solved_count, u.username, p.content_hash
+                FROM puzzles_fts f
+                JOIN puzzles p ON p.id = f.rowid
+                LEFT JOIN users u ON p.author_id = u.id
+                WHERE puzzles_fts MATCH ?
+                ORDER BY bm25(puzzles_fts, 10.0, 5.0, 1.0)
+                LIMIT ? OFFSET ?
+            """, (match, limit + 1, offset))
+            rows = cursor.fetchall()
+            
+            puzzles = [self._summary_from_row(row) for row in rows[:limit]]
+            next_offset = offset + limit if len(rows) > limit else None
+            return {'status': 'success', 'data': {'puzzles': puzzles, 'next_offset': next_offset}}
+            
+        except Exception as e:
+            print(f"[ERROR] Failed to search puzzles: {e}")
+            return {'status': 'error', 'message': 'Failed to search puzzles'}
+        finally:
+            if 'conn' in locals():
+                self.pool.release(conn)
+
+    @staticmethod
+    def _encode_cursor(sort_value, puzzle_id):
+        """Pack the last row's sort key into an opaque cursor string"""
+        return base64.urlsafe_b64encode(json.dumps([sort_value, puzzle_id]).encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def _decode_cursor(cursor):
+        """Unpack a cursor from _encode_cursor into a (sort value, id) pair"""
+        try:
+            sort_value, puzzle_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        except Exception:
+            raise ValueError("malformed cursor")
+        return sort_value, int(puzzle_id)
 
     def get_puzzle(self, puzzle_id):
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.acquire()
             cursor = conn.cursor()
             
             cursor.execute("""
                 SELECT p.id, p.title, p.grid, p.clues, p.tags, p.author_id, p.date, p.solved_count,
-                       p.solution_key, u.username as author_name
+                       p.solution_key, u.username as author_name, p.content_hash
                 FROM puzzles p
                 LEFT JOIN users u ON p.author_id = u.id
                 WHERE p.id = ?
@@ -90,12 +329,13 @@ class PuzzleManager:
                     'title': row[1],
                     'grid': json.loads(row[2]),
                     'clues': json.loads(row[3]),
-                    'tags': row[4].split(',') if row[4] else [],
+                    'tags': parse_tags(row[4]),
                     'author_id': row[5],
                     'date': row[6],
                     'solved_count': row[7],
                     'solution_key': json.loads(row[8]),
-                    'author_name': row[9]
+                    'author_name': row[9],
+                    'content_hash': row[10]
                 }
                 return puzzle
             return None
@@ -105,27 +345,35 @@ class PuzzleManager:
             return None
         finally:
             if 'conn' in locals():
-                conn.close()
+                self.pool.release(conn)
 
     def create_puzzle(self, title, grid, clues, solution_key, tags, author_id):
+        tags = parse_tags(tags)
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.acquire()
             cursor = conn.cursor()
             
-            cursor.execute("""
-                INSERT INTO puzzles (title, grid, clues, solution_key, tags, author_id)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
+            columns = (
                 title,
                 json.dumps(grid),
                 json.dumps(clues),
                 json.dumps(solution_key),
                 ','.join(tags),
                 author_id
-            ))
+            )
+            cursor.execute("""
+                INSERT INTO puzzles (title, grid, clues, solution_key, tags, author_id, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (*columns, content_hash(*columns)))
             
             puzzle_id = cursor.lastrowid
+            cursor.executemany("INSERT INTO puzzle_tags (tag, puzzle_id) VALUES (?, ?)",
+                               [(tag, puzzle_id) for tag in tags])
+            cursor.execute("INSERT INTO puzzles_fts (rowid, title, tags, clues) VALUES (?, ?, ?, ?)",
+                           (puzzle_id, title, ' '.join(tags), clue_text(clues)))
             conn.commit()
+            self.list_cache.invalidate()
+            self.versions.bump('puzzles')
             return puzzle_id
             
         except Exception as e:
@@ -133,11 +381,95 @@ class PuzzleManager:
             return None
         finally:
             if 'conn' in locals():
-                conn.close()
+                self.pool.release(conn)
+
+    def rebuild_tags(self):
+        """Repopulate puzzle_tags from the tags column of every puzzle"""
+        try:
+            conn = self.pool.acquire()
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, tags FROM puzzles")
+            rows = [(tag, puzzle_id) for puzzle_id, raw in cursor.fetchall() for tag in parse_tags(raw)]
+            cursor.execute("DELETE FROM puzzle_tags")
+            cursor.executemany("INSERT INTO puzzle_tags (tag, puzzle_id) VALUES (?, ?)", rows)
+            conn.commit()
+            self.list_cache.invalidate()
+            print(f"[DEBUG] Indexed {len(rows)} puzzle tags")
+        except Exception as e:
+            print(f"[ERROR] Failed to rebuild puzzle tags: {e}")
+        finally:
+            if 'conn' in locals():
+                self.pool.release(conn)
+
+    def rebuild_content_hashes(self, missing_only=True):
+        """Compute content_hash for puzzles that lack one (or for every puzzle)"""
+        try:
+            conn = self.pool.acquire()
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT id, title, grid, clues, solution_key, tags, author_id
+                FROM puzzles
+                {'WHERE content_hash IS NULL' if missing_only else ''}
+            """)
+            rows = [(content_hash(*row[1:]), row[0]) for row in cursor.fetchall()]
+            if rows:
+                cursor.executemany("UPDATE puzzles SET content_hash = ? WHERE id = ?", rows)
+                conn.commit()
+                self.list_cache.invalidate()
+                print(f"[DEBUG] Computed content hashes for {len(rows)} puzzles")
+        except Exception as e:
+            print(f"[ERROR] Failed to compute puzzle content hashes: {e}")
+        finally:
+            if 'conn' in locals():
+                self.pool.release(conn)
+
+    def rebuild_search_index(self):
+        """Repopulate puzzles_fts from the puzzles table"""
+        try:
+            conn = self.pool.acquire()
+            cursor = conn.cursor()
+            cursor.execute("SELECT id, title, tags, clues FROM puzzles")
+            rows = [(puzzle_id, title, ' '.join(parse_tags(tags)), clue_text(clues))
+                    for puzzle_id, title, tags, clues in cursor.fetchall()]
+            cursor.execute("DELETE FROM puzzles_fts")
+            cursor.executemany("INSERT INTO puzzles_fts (rowid, title, tags, clues) VALUES (?, ?, ?, ?)", rows)
+            conn.commit()
+            print(f"[DEBUG] Indexed {len(rows)} puzzles for search")
+        except Exception as e:
+            print(f"[ERROR] Failed to rebuild search index: {e}")
+        finally:
+            if 'conn' in locals():
+                self.pool.release(conn)
 
 class SubmissionManager:
-    def __init__(self, db_path='DATABASE-puzzles.db'):
-        self.db_path = db_path
+    def __init__(self, pool, list_cache=None, durability='group', flush_interval=0.005):
+        self.pool = pool
+        # Puzzle list cache to invalidate when a solve bumps solved_count
+        self.list_cache = list_cache
+        # Compiled solution keys by puzzle id; puzzles are immutable once created
+        self.solutions = LRUCache(SOLUTION_CACHE_SIZE)
+        # Grading happens on the request thread; persisting goes through the writer
+        self.writer = SubmissionWriter(pool, self._write_submission,
+                                       durability=durability, flush_interval=flush_interval)
+        self.writer.add_listener(self._on_commit)
+
+    def get_compiled_solution(self, puzzle_id):
+        """Return the CompiledSolution for a puzzle, or None if it does not exist"""
+        compiled = self.solutions.get(puzzle_id)
+        if compiled is None:
+            try:
+                conn = self.pool.acquire()
+                cursor = conn.cursor()
+                cursor.execute("SELECT solution_key FROM puzzles WHERE id = ?", (puzzle_id,))
+                row = cursor.fetchone()
+            finally:
+                if 'conn' in locals():
+                    self.pool.release(conn)
+            if not row:
+                return None
+            compiled = CompiledSolution(json.loads(row[0]))
+            self.solutions.put(puzzle_id, compiled)
+        return compiled
 
     def submit_solution(self, puzzle_id, user_id, submitted_grid, time_taken):
         try:
@@ -145,85 +477,128 @@ class SubmissionManager:
                 print("[ERROR] Submission parameters incomplete")
                 return False, "Submission parameters incomplete"
 
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Get the correct answer for the puzzle
-            cursor.execute("SELECT solution_key FROM puzzles WHERE id = ?", (puzzle_id,))
-            row = cursor.fetchone()
-            if not row:
-                print(f"[ERROR] Puzzle does not exist: {puzzle_id}")
+            try:
+                puzzle_id = int(puzzle_id)
+            except (TypeError, ValueError):
                 return False, "Puzzle does not exist"
             
+            # Get the correct answer for the puzzle
             try:
-                solution_key = json.loads(row[0])
+                solution = self.get_compiled_solution(puzzle_id)
                 if isinstance(submitted_grid, str):
                     submitted_grid = json.loads(submitted_grid)
             except json.JSONDecodeError as e:
                 print(f"[ERROR] JSON parsing failed: {e}")
                 return False, "Answer format error"
+            if solution is None:
+                print(f"[ERROR] Puzzle does not exist: {puzzle_id}")
+                return False, "Puzzle does not exist"
             
-            # Validate grid size
-            if (len(submitted_grid) != len(solution_key) or 
-                any(len(row) != len(solution_key[0]) for row in submitted_grid)):
+            # Check answer; None means the grid size is wrong
+            incorrect_cells = solution.grade(submitted_grid)
+            if incorrect_cells is None:
                 print("[ERROR] Submitted answer grid size is incorrect")
                 return False, "Answer format incorrect"
+            is_correct = not incorrect_cells
             
-            # Check answer
-            incorrect_cells = []
-            is_correct = True
-            for i, row in enumerate(submitted_grid):
-                for j, cell in enumerate(row):
-                    if solution_key[i][j] != '#' and cell.upper() != solution_key[i][j].upper():
-                        incorrect_cells.append([i, j])
-                        is_correct = False
-            
-            # Record submission
-            cursor.execute("""
-                INSERT INTO submissions (puzzle_id, user_id, grid_submitted, time_taken, result, incorrect_cells)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                puzzle_id, 
-                user_id, 
-                json.dumps(submitted_grid),
-                time_taken,
-                'correct' if is_correct else 'incorrect',
-                json.dumps(incorrect_cells) if incorrect_cells else None
-            ))
-            
-            # Update puzzle statistics
-            if is_correct:
-                cursor.execute("""
-                    UPDATE puzzles 
-                    SET solved_count = solved_count + 1,
-                        last_solved = CURRENT_TIMESTAMP
-                    WHERE id = ?
-                """, (puzzle_id,))
-                
-                # Update user statistics
-                cursor.execute("""
-                    INSERT INTO user_stats (user_id, puzzles_solved, avg_time, last_login)
-                    VALUES (?, 1, ?, CURRENT_TIMESTAMP)
-                    ON CONFLICT(user_id) DO UPDATE SET
-                        puzzles_solved = puzzles_solved + 1,
-                        avg_time = (
-                            (avg_time * puzzles_solved + ?) / (puzzles_solved + 1)
-                        ),
-                        last_login = CURRENT_TIMESTAMP
-                """, (user_id, time_taken, time_taken))
-            
-            conn.commit()
+            self.writer.submit({
+                'puzzle_id': puzzle_id,
+                'user_id': user_id,
+                'timestamp': time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime()),
+                'grid': json.dumps(submitted_grid),
+                'time_taken': time_taken,
+                'is_correct': is_correct,
+                'incorrect_cells': json.dumps(incorrect_cells) if incorrect_cells else None
+            })
             return is_correct, "Correct answer!" if is_correct else f"Incorrect answer, {len(incorrect_cells)} cells are wrong"
             
         except Exception as e:
             print(f"[ERROR] Failed to submit answer: {e}")
             return False, f"Submission failed: {str(e)}"
-        finally:
-            if 'conn' in locals():
-                conn.close()
+
+    def _write_submission(self, cursor, record):
+        """Write one graded submission and its statistics; the writer commits"""
+        puzzle_id = record['puzzle_id']
+        user_id = record['user_id']
+        time_taken = record['time_taken']
+        is_correct = record['is_correct']
+        
+        # Record submission
+        cursor.execute("""
+            INSERT INTO submissions (puzzle_id, user_id, grid_submitted, time_taken, result, incorrect_cells, timestamp)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (
+            puzzle_id, 
+            user_id, 
+            record['grid'],
+            time_taken,
+            'correct' if is_correct else 'incorrect',
+            record['incorrect_cells'],
+            record['timestamp']
+        ))
+        
+        # Update puzzle statistics
+        if is_correct:
+            cursor.execute("""
+                UPDATE puzzles 
+                SET solved_count = solved_count + 1,
+                    last_solved = CURRENT_TIMESTAMP
+                WHERE id = ?
+            """, (puzzle_id,))
+        
+        # Update user statistics; every SET expression sees the row before this update
+        solved = 1 if is_correct else 0
+        cursor.execute("""
+            INSERT INTO user_stats (user_id, puzzles_solved, avg_time, attempts, best_time, streak, best_streak, last_login)
+            VALUES (?, ?, ?, 1, ?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP END)
+            ON CONFLICT(user_id) DO UPDATE SET
+                puzzles_solved = puzzles_solved + excluded.puzzles_solved,
+                avg_time = CASE WHEN excluded.puzzles_solved > 0
+                           THEN (avg_time * puzzles_solved + excluded.avg_time) / (puzzles_solved + 1)
+                           ELSE avg_time END,
+                attempts = attempts + 1,
+                best_time = CASE WHEN excluded.best_time IS NOT NULL AND (best_time IS NULL OR excluded.best_time < best_time)
+                            THEN excluded.best_time ELSE best_time END,
+                streak = CASE WHEN excluded.streak > 0 THEN streak + 1 ELSE 0 END,
+                best_streak = MAX(best_streak, CASE WHEN excluded.streak > 0 THEN streak + 1 ELSE 0 END),
+                last_login = CASE WHEN excluded.puzzles_solved > 0 THEN CURRENT_TIMESTAMP ELSE last_login END
+        """, (
+            user_id,
+            solved,
+            time_taken if is_correct else 0,
+            time_taken if is_correct else None,
+            solved,
+            solved,
+            is_correct
+        ))
+        
+        # Keep the materialized leaderboard row in step with this submission
+        cursor.execute("""
+            INSERT INTO leaderboard (user_id, username, solved_count, total_time, avg_time, attempts, accuracy)
+            SELECT id, username, ?, ?, ?, 1, ? FROM users WHERE id = ?
+            ON CONFLICT(user_id) DO UPDATE SET
+                solved_count = solved_count + excluded.solved_count,
+                total_time = total_time + excluded.total_time,
+                avg_time = CASE WHEN solved_count + excluded.solved_count > 0
+                           THEN (total_time + excluded.total_time) / (solved_count + excluded.solved_count)
+                           END,
+                attempts = attempts + 1,
+                accuracy = 100.0 * (solved_count + excluded.solved_count) / (attempts + 1)
+        """, (
+            solved,
+            time_taken if is_correct else 0,
+            time_taken if is_correct else None,
+            100.0 * solved,
+            user_id
+        ))
+
+    def _on_commit(self, records):
+        """Invalidate the puzzle list once a committed batch has bumped solved_count"""
+        if self.list_cache is not None and any(record['is_correct'] for record in records):
+            self.list_cache.invalidate()
 
     def handle_submit_answer(self, user_id, puzzle_id, answer, time_taken):
-        conn = sqlite3.connect(DATABASE)
+        conn = self.pool.acquire()
         try:
             cursor = conn.cursor()
             # Get correct answer
@@ -253,122 +628,269 @@ class SubmissionManager:
             return {'status': 'error', 'message': f'Failed to submit answer: {str(e)}'}
         finally:
             if 'conn' in locals():
-                conn.close()
+                self.pool.release(conn)
 
 class StatisticsManager:
-    def __init__(self, db_path='DATABASE-puzzles.db'):
-        self.db_path = db_path
+    def __init__(self, pool, versions=None):
+        self.pool = pool
+        # Versions of the leaderboard, activity feed and per-user stats
+        self.versions = versions if versions is not None else ResourceVersions()
+        # Pushes to connections that sent a subscribe request
+        self.broker = PushBroker()
+        # Recent submissions, kept current by the submission writer
+        self.activity = ActivityFeed(pool, self.broker, ACTIVITY_FEED_SIZE)
 
     def get_user_statistics(self, user_id):
+        # user_stats is maintained by every submission, so this is a single-row lookup
+        empty = {'puzzles_solved': 0, 'avg_time': 0, 'last_login': None, 'attempts': 0,
+                 'accuracy': 0.0, 'best_time': None, 'streak': 0, 'best_streak': 0}
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self.pool.acquire()
             cursor = conn.cursor()
             
-            # Get user statistics
             cursor.execute("""
-                SELECT 
-                    COUNT(CASE WHEN s.result = 'correct' THEN 1 END) as solved_count,
-                    AVG(CASE WHEN s.result = 'correct' THEN s.time_taken END) as avg_time,
-                    u.last_login
-                FROM submissions s LEFT JOIN user_stats u ON s.user_id = u.user_id
-                WHERE s.user_id = ?
+                SELECT puzzles_solved, avg_time, last_login, attempts, best_time, streak, best_streak
+                FROM user_stats
+                WHERE user_id = ?
             """, (user_id,))
             
             row = cursor.fetchone()
             if row:
+                attempts = row[3] or 0
                 return {
-                    'puzzles_solved': row[0],
-                    'avg_time': row[1],
-                    'last_login': row[2]
+                    'puzzles_solved': row[0] or 0,
+                    'avg_time': row[1] or 0,
+                    'last_login': row[2],
+                    'attempts': attempts,
+                    'accuracy': 100.0 * (row[0] or 0) / attempts if attempts else 0.0,
+                    'best_time': row[4],
+                    'streak': row[5] or 0,
+                    'best_streak': row[6] or 0
                 }
-            return {'puzzles_solved': 0, 'avg_time': 0, 'last_login': None}
+            return empty
             
         except Exception as e:
             print(f"[ERROR] Failed to get user statistics: {e}")
-            return {'puzzles_solved': 0, 'avg_time': 0, 'last_login': None}
+            return empty
         finally:
             if 'conn' in locals():
-                conn.close()
+                self.pool.release(conn)
 
-    def get_leaderboard(self):
-        conn = sqlite3.connect(DATABASE)
+    def rebuild_user_stats(self):
+        """Recompute every user's aggregate columns in user_stats from the submissions table"""
         try:
+            conn = self.pool.acquire()
             cursor = conn.cursor()
+            cursor.execute("SELECT user_id, result, time_taken FROM submissions ORDER BY user_id, id")
+            
+            totals = {}
+            for user_id, result, time_taken in cursor.fetchall():
+                stats = totals.setdefault(user_id, {'solved': 0, 'total_time': 0.0, 'attempts': 0,
+                                                    'best_time': None, 'streak': 0, 'best_streak': 0})
+                stats['attempts'] += 1
+                if result == 'correct':
+                    stats['solved'] += 1
+                    stats['total_time'] += time_taken
+                    if stats['best_time'] is None or time_taken < stats['best_time']:
+                        stats['best_time'] = time_taken
+                    stats['streak'] += 1
+                    stats['best_streak'] = max(stats['best_streak'], stats['streak'])
+                else:
+                    stats['streak'] = 0
+            
             cursor.execute("""
-                SELECT 
-                    u.username,
-                    COUNT(CASE WHEN s.result = 'correct' THEN 1 END) as solved_count,
-                    AVG(CASE WHEN s.result = 'correct' THEN s.time_taken END) as avg_time
-                FROM users u
-                LEFT JOIN submissions s ON u.id = s.user_id
-                GROUP BY u.id, u.username
-                ORDER BY solved_count DESC, avg_time ASC
-                LIMIT 10
+                UPDATE user_stats
+                SET puzzles_solved = 0, avg_time = 0, attempts = 0, best_time = NULL, streak = 0, best_streak = 0
             """)
+            cursor.executemany("""
+                INSERT INTO user_stats (user_id, puzzles_solved, avg_time, attempts, best_time, streak, best_streak)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(user_id) DO UPDATE SET
+                    puzzles_solved = excluded.puzzles_solved,
+                    avg_time = excluded.avg_time,
+                    attempts = excluded.attempts,
+                    best_time = excluded.best_time,
+                    streak = excluded.streak,
+                    best_streak = excluded.best_streak
+            """, [
+                (user_id, s['solved'], s['total_time'] / s['solved'] if s['solved'] else 0,
+                 s['attempts'], s['best_time'], s['streak'], s['best_streak'])
+                for user_id, s in totals.items()
+            ])
+            conn.commit()
+            print(f"[DEBUG] Rebuilt user statistics for {len(totals)} users")
+        except Exception as e:
+            print(f"[ERROR] Failed to rebuild user statistics: {e}")
+        finally:
+            if 'conn' in locals():
+                self.pool.release(conn)
+
+    # Ranking modes served from the materialized leaderboard. Each ORDER BY is
+    # matched by a covering index in schema.sql, so a page is an index range scan.
+    LEADERBOARD_MODES = {
+        'speed': ("WHERE solved_count > 0", "avg_time ASC, solved_count DESC"),
+        'accuracy': ("", "accuracy DESC, attempts DESC"),
+        'solved': ("", "solved_count DESC, avg_time ASC")
+    }
+    # Names from the API specification's ranking_criteria
+    LEADERBOARD_ALIASES = {
+        'average_solve_time': 'speed',
+        'puzzles_solved': 'solved'
+    }
+    MAX_LEADERBOARD_LIMIT = 100
+
+    def get_leaderboard(self, sort_by='solved', limit=10, offset=0):
+        sort_by = self.LEADERBOARD_ALIASES.get(sort_by, sort_by)
+        if sort_by not in self.LEADERBOARD_MODES:
+            return {'status': 'error', 'message': 'Unknown ranking criteria specified'}
+        try:
+            limit = max(1, min(int(limit), self.MAX_LEADERBOARD_LIMIT))
+            offset = max(0, int(offset))
+        except (TypeError, ValueError):
+            return {'status': 'error', 'message': 'Bad limit or offset'}
+
+        where, order = self.LEADERBOARD_MODES[sort_by]
+        conn = self.pool.acquire()
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT username, solved_count, avg_time, attempts, accuracy
+                FROM leaderboard
+                {where}
+                ORDER BY {order}
+                LIMIT ? OFFSET ?
+            """, (limit, offset))
             
             leaderboard = []
-            for row in cursor.fetchall():
+            for rank, row in enumerate(cursor.fetchall(), offset + 1):
                 leaderboard.append({
+                    'rank': rank,
                     'username': row[0],
                     'puzzles_solved': row[1],
-                    'avg_time': row[2] if row[2] is not None else 0
+                    'avg_time': row[2] if row[2] is not None else 0,
+                    'total_attempts': row[3],
+                    'accuracy': row[4]
                 })
             
-            return {'status': 'success', 'leaderboard': leaderboard}
+            return {
+                'status': 'success',
+                'criteria_used': sort_by,
+                'limit': limit,
+                'offset': offset,
+                'leaderboard': leaderboard
+            }
             
         except Exception as e:
             print(f"[ERROR] Failed to get leaderboard: {e}")
             return {'status': 'error', 'message': str(e)}
         finally:
             if 'conn' in locals():
-                conn.close()
+                self.pool.release(conn)
+
+    def publish_leaderboard_changes(self, records):
+        """
+        Submission writer listener: push the updated leaderboard rows of the
+        users in a committed batch. Clients merge them into the ranking they
+        show; nothing is sent when nobody is subscribed.
+        """
+        if not records or not self.broker.has_subscribers(LEADERBOARD_TOPIC):
+            return
+        user_ids = list({record['user_id'] for record in records})
+        try:
+            conn = self.pool.acquire()
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT username, solved_count, avg_time, attempts, accuracy
+                FROM leaderboard
+                WHERE user_id IN ({', '.join('?' * len(user_ids))})
+            """, user_ids)
+            entries = [{
+                'username': row[0],
+                'puzzles_solved': row[1],
+                'avg_time': row[2] if row[2] is not None else 0,
+                'total_attempts': row[3],
+                'accuracy': row[4]
+            } for row in cursor.fetchall()]
+        except Exception as e:
+            print(f"[ERROR] Failed to read leaderboard changes: {e}")
+            return
+        finally:
+            if 'conn' in locals():
+                self.pool.release(conn)
+        if entries:
+            self.broker.publish(LEADERBOARD_TOPIC, {'entries': entries})
+
+    def bump_versions(self, records):
+        """Submission writer listener: mark every resource a committed batch changed"""
+        if not records:
+            return
+        names = {'leaderboard', 'activity'}
+        names.update(f"stats:{record['user_id']}" for record in records)
+        if any(record['is_correct'] for record in records):
+            names.add('puzzles')  # solved_count
+        self.versions.bump(*names)
 
-    def get_recent_activity(self):
-        conn = sqlite3.connect(DATABASE)
+    def rebuild_leaderboard(self):
+        """Recompute the materialized leaderboard from the full submission history"""
+        conn = self.pool.acquire()
         try:
             cursor = conn.cursor()
+            cursor.execute("DELETE FROM leaderboard")
             cursor.execute("""
-                SELECT 
+                INSERT INTO leaderboard (user_id, username, solved_count, total_time, avg_time, attempts, accuracy)
+                SELECT
+                    u.id,
                     u.username,
-                    p.title,
-                    s.result,
-                    s.time_taken,
-                    s.timestamp
-                FROM submissions s
-                JOIN users u ON s.user_id = u.id
-                JOIN puzzles p ON s.puzzle_id = p.id
-                ORDER BY s.timestamp DESC
-                LIMIT 10
+                    COUNT(CASE WHEN s.result = 'correct' THEN 1 END),
+                    COALESCE(SUM(CASE WHEN s.result = 'correct' THEN s.time_taken END), 0),
+                    AVG(CASE WHEN s.result = 'correct' THEN s.time_taken END),
+                    COUNT(s.id),
+                    CASE WHEN COUNT(s.id) > 0
+                         THEN 100.0 * COUNT(CASE WHEN s.result = 'correct' THEN 1 END) / COUNT(s.id)
+                         ELSE 0 END
+                FROM users u
+                LEFT JOIN submissions s ON u.id = s.user_id
+                GROUP BY u.id, u.username
             """)
-            
-            activities = []
-            for row in cursor.fetchall():
-                activities.append({
-                    'username': row[0],
-                    'puzzle_title': row[1],
-                    'result': row[2],
-                    'time_taken': row[3],
-                    'timestamp': row[4]
-                })
-            
-            return {'status': 'success', 'activities': activities}
-            
+            conn.commit()
+            print(f"[DEBUG] Rebuilt leaderboard for {cursor.rowcount} users")
+            return True
         except Exception as e:
-            print(f"[ERROR] Failed to get recent activity: {e}")
-            return {'status': 'error', 'message': str(e)}
+            print(f"[ERROR] Failed to rebuild leaderboard: {e}")
+            return False
         finally:
             if 'conn' in locals():
-                conn.close()
+                self.pool.release(conn)
+
+    def leaderboard_incomplete(self):
+        """True if some user has no leaderboard row"""
+        conn = self.pool.acquire()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT EXISTS (
+                    SELECT 1 FROM users u
+                    WHERE NOT EXISTS (SELECT 1 FROM leaderboard l WHERE l.user_id = u.id)
+                )
+            """)
+            return bool(cursor.fetchone()[0])
+        finally:
+            self.pool.release(conn)
 
-def handle_client_request(client_socket, puzzle_manager, submission_manager, stats_manager, session_manager):
+    def get_recent_activity(self, limit=10):
+        try:
+            limit = max(1, min(int(limit), ACTIVITY_FEED_SIZE))
+        except (TypeError, ValueError):
+            limit = 10
+        return {'status': 'success', 'activities': self.activity.recent(limit)}
+
+def dispatch_request(request, puzzle_manager, submission_manager, stats_manager, session_manager,
+                     connection=None):
+    """
+    Dispatch one decoded request to the managers and return the response dict.
+    connection is the push subscriber for the requesting connection, if any.
+    """
     try:
-        data = client_socket.recv(4096).decode('utf-8')
-        if not data:
-            return
-        
-        print(f"[DEBUG] Received request: {data}")
-        request = json.loads(data)
-        
         action = request.get('action')
         payload = request.get('payload', {})
         auth_token = request.get('auth_token')
@@ -378,7 +900,7 @@ def handle_client_request(client_socket, puzzle_manager, submission_manager, sta
         # Get user ID (if authenticated)
         user_id = None
         if auth_token:
-            user_id = session_manager.get_user_id(auth_token)
+            user_id = session_manager.get_user_id(auth_token, fresh=action in WRITE_ACTIONS)
             print(f"[DEBUG] Auth token: {auth_token}")
             print(f"[DEBUG] Current user ID: {user_id}")
         
@@ -386,24 +908,58 @@ def handle_client_request(client_socket, puzzle_manager, submission_manager, sta
         if action in ['submit_solution', 'get_stats', 'create_puzzle']:
             if not auth_token:
                 print("[ERROR] Missing auth token")
-                response = {'status': 'error', 'message': 'Login required'}
-                client_socket.send(json.dumps(response).encode('utf-8'))
-                return
+                return {'status': 'error', 'message': 'Login required'}
             
             if not user_id:
                 print(f"[ERROR] Invalid auth token: {auth_token}")
-                response = {'status': 'error', 'message': 'Session expired, please log in again'}
-                client_socket.send(json.dumps(response).encode('utf-8'))
-                return
+                return {'status': 'error', 'message': 'Session expired, please log in again'}
         
-        if action == 'get_puzzles':
+        # Conditional reads: answer with a bare not_modified when the client
+        # already holds the current version. The version is read before the
+        # data, so a change that races with this request is seen next time.
+        version = None
+        resource = VERSIONED_ACTIONS.get(action)
+        if resource:
+            versions = puzzle_manager.versions if resource == 'puzzles' else stats_manager.versions
+            if resource == 'stats':
+                resource = f'stats:{user_id}'
+            version = versions.get(resource)
+            if request.get('if_version') == version:
+                return {'status': 'not_modified', 'version': version}
+        
+        # Tag filters ('tag') and new puzzle tags ('tags') must be strings
+        try:
+            parse_tags(payload.get('tag'))
+            parse_tags(payload.get('tags'))
+        except ValueError:
+            return {'status': 'error', 'message': 'Bad tags'}
+        
+        if action == 'get_puzzles' and payload.get('summary'):
+            response = puzzle_manager.get_puzzle_summaries(
+                sort_by=payload.get('sort_by', 'date'),
+                order=payload.get('order', 'desc'),
+                tag=payload.get('tag'),
+                limit=payload.get('limit', DEFAULT_PAGE_SIZE),
+                cursor=payload.get('cursor'),
+                tag_mode=payload.get('tag_mode', 'all')
+            )
+            
+        elif action == 'get_puzzles':
             puzzles = puzzle_manager.get_puzzle_list(
                 sort_by=payload.get('sort_by', 'date'),
                 order=payload.get('order', 'desc'),
-                tag=payload.get('tag')
+                tag=payload.get('tag'),
+                tag_mode=payload.get('tag_mode', 'all')
             )
             response = {'status': 'success', 'data': {'puzzles': puzzles}}
             
+        elif action == 'search_puzzles':
+            response = puzzle_manager.search_puzzles(
+                payload.get('query'),
+                limit=payload.get('limit', DEFAULT_PAGE_SIZE),
+                offset=payload.get('offset', 0)
+            )
+            
         elif action == 'get_puzzle':
             puzzle_id = payload.get('puzzle_id')
             puzzle = puzzle_manager.get_puzzle(puzzle_id)
@@ -444,13 +1000,50 @@ def handle_client_request(client_socket, puzzle_manager, submission_manager, sta
             response = {'status': 'success', 'data': stats}
             
         elif action == 'get_leaderboard':
-            leaderboard = stats_manager.get_leaderboard()
+            leaderboard = stats_manager.get_leaderboard(
+                sort_by=payload.get('sort_by') or payload.get('ranking_criteria') or 'solved',
+                limit=payload.get('limit', 10),
+                offset=payload.get('offset', 0)
+            )
             response = leaderboard
             
         elif action == 'get_recent_activity':
-            activities = stats_manager.get_recent_activity()
+            activities = stats_manager.get_recent_activity(payload.get('limit', 10))
             response = activities
             
+        elif action == 'subscribe':
+            topics = payload.get('topics') or [ActivityFeed.TOPIC]
+            if connection is None:
+                response = {'status': 'error', 'message': 'Subscriptions need a persistent connection'}
+            elif not isinstance(topics, list) or not set(topics) <= SUBSCRIBE_TOPICS:
+                response = {'status': 'error', 'message': f'Unknown topic, expected one of {sorted(SUBSCRIBE_TOPICS)}'}
+            else:
+                stats_manager.broker.subscribe(connection, topics)
+                response = {
+                    'status': 'success',
+                    'data': {
+                        'topics': sorted(connection.topics),
+                        'activities': stats_manager.activity.recent()
+                    }
+                }
+            
+        elif action == 'unsubscribe':
+            if connection is not None:
+                stats_manager.broker.unsubscribe(connection, payload.get('topics'))
+            response = {'status': 'success', 'data': {'topics': sorted(connection.topics) if connection else []}}
+            
+        elif action == 'get_server_stats':
+            response = {
+                'status': 'success',
+                'data': {
+                    'db_pool': puzzle_manager.pool.stats(),
+                    'puzzle_list_cache': puzzle_manager.list_cache.stats(),
+                    'solution_cache': submission_manager.solutions.stats(),
+                    'submission_writer': submission_manager.writer.stats(),
+                    'push': stats_manager.broker.stats()
+                }
+            }
+            
         elif action == 'create_puzzle':
             title = payload.get('title')
             grid = payload.get('grid')
@@ -461,43 +1054,312 @@ def handle_client_request(client_socket, puzzle_manager, submission_manager, sta
             if not all([title, grid, clues, solution_key]):
                 response = {'status': 'error', 'message': 'Missing required puzzle information'}
             else:
-                puzzle_id = puzzle_manager.create_puzzle(title, grid, clues, solution_key, tags, user_id)
-                if puzzle_id:
-                    response = {'status': 'success', 'data': {'puzzle_id': puzzle_id}}
+                # Reject malformed puzzles here rather than on every later read and grade
+                problem = validate_puzzle(title, grid, clues, solution_key, parse_tags(tags))
+                if problem:
+                    print(f"[DEBUG] Rejected puzzle from user {user_id}: {problem}")
+                    response = {'status': 'error', 'message': f'Puzzle rejected: {problem}'}
                 else:
-                    response = {'status': 'error', 'message': 'Failed to create puzzle'}
+                    puzzle_id = puzzle_manager.create_puzzle(title, grid, clues, solution_key, tags, user_id)
+                    if puzzle_id:
+                        response = {'status': 'success', 'data': {'puzzle_id': puzzle_id}}
+                    else:
+                        response = {'status': 'error', 'message': 'Failed to create puzzle'}
             
         else:
             response = {'status': 'error', 'message': 'Unknown action'}
         
-        print(f"[DEBUG] Sending response: {response}")
-        client_socket.send(json.dumps(response).encode('utf-8'))
+        if version is not None and response.get('status') == 'success':
+            response = dict(response, version=version)
+        return response
         
-    except json.JSONDecodeError:
+    except Exception as e:
+        print(f"[ERROR] Failed to handle request: {e}")
+        return {'status': 'error', 'message': str(e)}
+
+def process_request(data, puzzle_manager, submission_manager, stats_manager, session_manager,
+                    connection=None):
+    """
+    Decode one JSON request and dispatch it.
+    Returns (response, keep_alive). The request's optional request_id is echoed
+    in the response so pipelined replies can be matched, and keep_alive tells
+    the caller whether the client wants the connection left open.
+    """
+    try:
+        if isinstance(data, bytes):
+            data = data.decode('utf-8')
+        print(f"[DEBUG] Received request: {data}")
+        request = json.loads(data)
+    except ValueError:
         print("[ERROR] JSON parsing failed")
-        response = {'status': 'error', 'message': 'JSON format error'}
-        client_socket.send(json.dumps(response).encode('utf-8'))
+        return {'status': 'error', 'message': 'JSON format error'}, False
+    if not isinstance(request, dict):
+        return {'status': 'error', 'message': 'JSON format error'}, False
+
+    response = dispatch_request(request, puzzle_manager, submission_manager, stats_manager, session_manager,
+                                connection)
+    if 'request_id' in request:
+        response = dict(response, request_id=request['request_id'])
+    return response, bool(request.get('keep_alive'))
+
+def handle_client_request(client_socket, puzzle_manager, submission_manager, stats_manager, session_manager,
+                          max_message_size=DEFAULT_MAX_MESSAGE_SIZE):
+    """Serve requests on one connection until the client stops asking for keep-alive"""
+    reader = LineReader(client_socket, max_message_size=max_message_size)
+    # Responses and pushes share the socket, so writes are serialized
+    write_lock = threading.Lock()
+    subscriber = SocketSubscriber(client_socket, write_lock)
+    try:
+        while True:
+            # Idle keep-alive connections are closed after KEEP_ALIVE_TIMEOUT,
+            # unless they are subscribed and waiting for pushes
+            data = reader.readline(timeout=None if subscriber.topics else KEEP_ALIVE_TIMEOUT)
+            if data is None:
+                break
+            if not data.strip():
+                continue
+            
+            response, keep_alive = process_request(data, puzzle_manager, submission_manager,
+                                                   stats_manager, session_manager, subscriber)
+            print(f"[DEBUG] Sending response: {response}")
+            with write_lock:
+                client_socket.settimeout(None)
+                send_message(client_socket, response)
+            if not keep_alive:
+                break
+        
+    except MessageTooLarge as e:
+        # The rest of the stream cannot be re-framed, so answer and hang up
+        print(f"[ERROR] {e}")
+        with write_lock:
+            client_socket.settimeout(None)
+            send_message(client_socket, {'status': 'error', 'message': 'Request too large'})
+    except socket.timeout:
+        print("[DEBUG] Closing idle connection")
     except Exception as e:
         print(f"[ERROR] Failed to handle request: {e}")
-        response = {'status': 'error', 'message': str(e)}
-        client_socket.send(json.dumps(response).encode('utf-8'))
     finally:
+        stats_manager.broker.unsubscribe(subscriber)
+        subscriber.close()
         client_socket.close()
 
-def main():
-    host = 'localhost'
-    port = 5001
+class AsyncPuzzleServer:
+    """
+    Serves the same JSON protocol as handle_client_request from a single event loop.
+    Database work runs on a bounded thread pool and the number of requests being
+    processed at once is capped, so a burst of clients queues instead of spawning
+    a thread per connection.
+    """
+    def __init__(self, host, port, managers, backlog=128, max_in_flight=64, max_workers=8,
+                 max_pipelined=16, max_message_size=DEFAULT_MAX_MESSAGE_SIZE, shutdown_timeout=10):
+        self.host = host
+        self.port = port
+        self.managers = managers  # (puzzle_manager, submission_manager, stats_manager, session_manager)
+        self.backlog = backlog
+        self.max_in_flight = max_in_flight
+        self.max_workers = max_workers
+        self.max_pipelined = max_pipelined
+        self.max_message_size = max_message_size
+        self.shutdown_timeout = shutdown_timeout
+
+        self._executor = None
+        self._in_flight = None
+        self._connections = set()
+        self._stop_event = None
+
+    async def _process(self, data, writer, write_lock, outstanding, closing, subscriber):
+        """Run one request on the executor and write its response"""
+        try:
+            async with self._in_flight:
+                loop = asyncio.get_running_loop()
+                response, keep_alive = await loop.run_in_executor(
+                    self._executor, process_request, data, *self.managers, subscriber)
+
+            print(f"[DEBUG] Sending response: {response}")
+            async with write_lock:
+                writer.write(encode_message(response))
+                await writer.drain()
+            if not keep_alive:
+                closing.set()
+        finally:
+            outstanding.release()
+
+    async def _handle_connection(self, reader, writer):
+        address = writer.get_extra_info('peername')
+        print(f"Accepted connection from {address}")
+        write_lock = asyncio.Lock()
+        closing = asyncio.Event()
+        # Pipelined requests on a keep-alive connection are processed concurrently
+        # and answered as they complete; clients match replies by request_id.
+        outstanding = asyncio.Semaphore(self.max_pipelined)
+        tasks = set()
+        subscriber = StreamSubscriber(asyncio.get_running_loop(), writer)
+        try:
+            while not closing.is_set() and not self._stop_event.is_set():
+                await outstanding.acquire()
+                read_task = asyncio.ensure_future(reader.readline())
+                closing_task = asyncio.ensure_future(closing.wait())
+                # Subscribed connections stay open while they wait for pushes
+                idle_timeout = None if subscriber.topics else KEEP_ALIVE_TIMEOUT
+                done, _ = await asyncio.wait({read_task, closing_task}, timeout=idle_timeout,
+                                             return_when=asyncio.FIRST_COMPLETED)
+                closing_task.cancel()
+                if read_task not in done:
+                    # Idle timeout, or a request without keep_alive has been answered
+                    read_task.cancel()
+                    outstanding.release()
+                    break
+
+                try:
+                    data = read_task.result()
+                except ValueError as e:
+                    # Line longer than the stream limit; it cannot be re-framed
+                    outstanding.release()
+                    print(f"[ERROR] Request from {address} too large: {e}")
+                    async with write_lock:
+                        writer.write(encode_message({'status': 'error', 'message': 'Request too large'}))
+                        await writer.drain()
+                    break
+                if not data or not data.strip():
+                    outstanding.release()
+                    if not data:
+                        break
+                    continue
+
+                task = asyncio.ensure_future(self._process(data, writer, write_lock, outstanding, closing,
+                                                           subscriber))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.gather(*tasks)
+        except (ConnectionError, asyncio.IncompleteReadError) as e:
+            print(f"[ERROR] Connection error from {address}: {e}")
+        except Exception as e:
+            print(f"[ERROR] Failed to handle request: {e}")
+        finally:
+            self.managers[2].broker.unsubscribe(subscriber)
+            subscriber.close()
+
+    def _track_connection(self, reader, writer):
+        task = asyncio.ensure_future(self._handle_connection(reader, writer))
+        self._connections.add(task)
+        task.add_done_callback(self._connections.discard)
+
+    def request_shutdown(self):
+        """Stop accepting connections and let in-flight requests finish"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+
+    async def serve(self):
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix='puzzle-db')
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self._stop_event = asyncio.Event()
+
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.request_shutdown)
+            except (NotImplementedError, RuntimeError):
+                pass  # Not supported on this platform; KeyboardInterrupt still works
+
+        server = await asyncio.start_server(self._track_connection, self.host, self.port,
+                                            backlog=self.backlog, reuse_address=True,
+                                            limit=self.max_message_size)
+        print(f"Puzzle server (asyncio) is listening on {self.host}:{self.port}")
+
+        try:
+            await self._stop_event.wait()
+        finally:
+            print("\nShutting down server...")
+            server.close()
+            await server.wait_closed()
+            if self._connections:
+                await asyncio.wait(list(self._connections), timeout=self.shutdown_timeout)
+            self._executor.shutdown(wait=True)
+
+def ensure_schema(pool, puzzle_manager, stats_manager):
+    """
+    Bring an existing database up to date with schema.sql and backfill any
+    derived tables that were just created.
+    """
+    conn = pool.acquire()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        existing_tables = {row[0] for row in cursor.fetchall()}
+        
+        with open(SCHEMA_FILE, 'r', encoding='utf-8') as f:
+            schema = f.read()
+        
+        # CREATE TABLE IF NOT EXISTS leaves older tables as they were. Columns
+        # are added first, since indexes in schema.sql may cover them
+        added_columns = {}
+        for table, migrations in (('user_stats', USER_STATS_MIGRATIONS), ('puzzles', PUZZLE_MIGRATIONS)):
+            added_columns[table] = []
+            if table not in existing_tables:
+                continue
+            cursor.execute(f"PRAGMA table_info({table})")
+            columns = {row[1] for row in cursor.fetchall()}
+            added_columns[table] = [name for name in migrations if name not in columns]
+            for name in added_columns[table]:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {migrations[name]}")
+        
+        # Likewise CREATE INDEX IF NOT EXISTS keeps an older definition; drop
+        # indexes whose definition changed so schema.sql recreates them
+        cursor.execute("SELECT name, sql FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")
+        existing_indexes = dict(cursor.fetchall())
+        for name, definition in SCHEMA_INDEX.findall(schema):
+            if name in existing_indexes and existing_indexes[name] != f"CREATE INDEX {name} {definition}":
+                print(f"[DEBUG] Recreating index {name}")
+                cursor.execute(f"DROP INDEX {name}")
+        conn.commit()
+        
+        # Every statement in schema.sql is CREATE ... IF NOT EXISTS
+        cursor.executescript(schema)
+    finally:
+        pool.release(conn)
+    
+    if added_columns['user_stats']:
+        print(f"[DEBUG] Added user_stats columns {added_columns['user_stats']}, recomputing user statistics")
+        stats_manager.rebuild_user_stats()
+    
+    # Also covers puzzles inserted directly by init_db.py
+    puzzle_manager.rebuild_content_hashes()
+    
+    if 'puzzle_tags' not in existing_tables:
+        print("[DEBUG] Indexing tags of existing puzzles")
+        puzzle_manager.rebuild_tags()
     
-    puzzle_manager = PuzzleManager()
-    submission_manager = SubmissionManager()
-    stats_manager = StatisticsManager()
+    if 'puzzles_fts' not in existing_tables:
+        print("[DEBUG] Building search index for existing puzzles")
+        puzzle_manager.rebuild_search_index()
+    
+    # Every user has a leaderboard row; init_db.py creates the table empty
+    # and older auth servers did not add one on registration
+    if 'leaderboard' not in existing_tables or stats_manager.leaderboard_incomplete():
+        print("[DEBUG] Building leaderboard from existing submissions")
+        stats_manager.rebuild_leaderboard()
+
+def main(mode='threaded', host='localhost', port=5001, backlog=128, max_in_flight=64, workers=8,
+         max_message_size=DEFAULT_MAX_MESSAGE_SIZE, rebuild_leaderboard=False,
+         durability='group', flush_interval_ms=5):
+    # Long-lived connections shared by all request threads
+    pool = ConnectionPool(DATABASE, max_size=workers)
+    list_cache = LRUCache(LIST_CACHE_SIZE, LIST_CACHE_TTL)
+    versions = ResourceVersions()
+    puzzle_manager = PuzzleManager(pool, list_cache, versions)
+    submission_manager = SubmissionManager(pool, list_cache, durability=durability,
+                                           flush_interval=flush_interval_ms / 1000)
+    stats_manager = StatisticsManager(pool, versions)
     
     # Create a new SessionManager instance and initialize database connection
     session_manager = SessionManager()
     
     # Ensure database tables are created
     try:
-        conn = sqlite3.connect(DATABASE)
+        conn = pool.acquire()
         cursor = conn.cursor()
         
         # Create sessions table (if not exists)
@@ -513,12 +1375,45 @@ def main():
         print(f"[ERROR] Failed to initialize database: {e}")
     finally:
         if 'conn' in locals():
-            conn.close()
+            pool.release(conn)
+    
+    try:
+        ensure_schema(pool, puzzle_manager, stats_manager)
+    except (sqlite3.Error, OSError) as e:
+        print(f"[ERROR] Failed to update database schema: {e}")
+    
+    stats_manager.activity.seed()
+    submission_manager.writer.add_listener(stats_manager.activity.on_commit)
+    # After every listener that updates in-memory state, so a reader that sees
+    # the new version also sees the new data
+    submission_manager.writer.add_listener(stats_manager.bump_versions)
+    submission_manager.writer.add_listener(stats_manager.publish_leaderboard_changes)
+    
+    if rebuild_leaderboard:
+        stats_manager.rebuild_leaderboard()
+        submission_manager.writer.stop()
+        pool.close_all()
+        return
+    
+    if mode == 'async':
+        server = AsyncPuzzleServer(
+            host, port,
+            (puzzle_manager, submission_manager, stats_manager, session_manager),
+            backlog=backlog, max_in_flight=max_in_flight, max_workers=workers,
+            max_message_size=max_message_size
+        )
+        try:
+            asyncio.run(server.serve())
+        except KeyboardInterrupt:
+            pass
+        submission_manager.writer.stop()
+        pool.close_all()
+        return
     
     server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
     server_socket.bind((host, port))
-    server_socket.listen(5)
+    server_socket.listen(backlog)
     
     print(f"Puzzle server is listening on {host}:{port}")
     
@@ -529,7 +1424,8 @@ def main():
             
             client_thread = threading.Thread(
                 target=handle_client_request,
-                args=(client_socket, puzzle_manager, submission_manager, stats_manager, session_manager)
+                args=(client_socket, puzzle_manager, submission_manager, stats_manager, session_manager),
+                kwargs={'max_message_size': max_message_size}
             )
             client_thread.start()
             
@@ -540,6 +1436,31 @@ def main():
             print(f"[ERROR] Server error: {e}")
     
     server_socket.close()
+    submission_manager.writer.stop()
+    pool.close_all()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Crossword puzzle server")
+    parser.add_argument('--mode', choices=['threaded', 'async'], default='threaded',
+                        help="threaded: one thread per connection; async: single event loop")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--backlog', type=int, default=128, help="listen() backlog")
+    parser.add_argument('--max-in-flight', type=int, default=64,
+                        help="async mode: maximum requests processed at once")
+    parser.add_argument('--workers', type=int, default=8,
+                        help="async mode: database worker threads")
+    parser.add_argument('--max-message-size', type=int, default=DEFAULT_MAX_MESSAGE_SIZE,
+                        help="largest request in bytes; longer requests are rejected")
+    parser.add_argument('--rebuild-leaderboard', action='store_true',
+                        help="recompute the leaderboard table from all submissions and exit")
+    parser.add_argument('--durability', choices=DURABILITY_MODES, default='group',
+                        help="sync: commit each submission; group: batch commits and wait for them; "
+                             "async: batch commits without waiting")
+    parser.add_argument('--flush-interval', type=float, default=5,
+                        help="milliseconds the submission writer waits to fill a batch")
+    args = parser.parse_args()
+    main(mode=args.mode, host=args.host, port=args.port, backlog=args.backlog,
+         max_in_flight=args.max_in_flight, workers=args.workers,
+         max_message_size=args.max_message_size, rebuild_leaderboard=args.rebuild_leaderboard,
+         durability=args.durability, flush_interval_ms=args.flush_interval) 
\ No newline at end of file
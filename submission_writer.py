@@ -0,0 +1,159 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+DURABILITY_MODES = ('sync', 'group', 'async')
+
+class SubmissionWriter:
+    """
+    Persists graded submissions through a single writer thread that commits
+    them in batches (group commit), so a burst of submissions shares one
+    transaction and one fsync instead of paying for one each.
+
+    The apply callable writes one record with a cursor; the writer owns the
+    transaction around it. Durability modes:
+      sync  - the caller writes and commits its own record inline (no batching)
+      group - the caller waits until the batch holding its record has committed
+      async - the caller returns at once; the record is committed within
+              flush_interval plus one commit, and is lost if the process dies first
+    Listeners registered with add_listener are called with the list of records
+    after every commit.
+    """
+    def __init__(self, pool, apply, durability='group', max_batch=256, flush_interval=0.005,
+                 max_pending=10000):
+        if durability not in DURABILITY_MODES:
+            raise ValueError(f"durability must be one of {DURABILITY_MODES}")
+        self.pool = pool
+        self.apply = apply
+        self.durability = durability
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._listeners = []
+        self._stats_lock = threading.Lock()
+        self._batches = 0
+        self._records = 0
+        self._failures = 0
+        self._stopped = threading.Event()
+        self._thread = None
+        if durability != 'sync':
+            self._thread = threading.Thread(target=self._run, name="submission-writer", daemon=True)
+            self._thread.start()
+
+    def add_listener(self, callback):
+        """Register callback(records) to run after each commit"""
+        self._listeners.append(callback)
+
+    def submit(self, record):
+        """
+        Persist one record. Returns a Future that resolves once the record is
+        committed; in group and sync modes it is already resolved on return and
+        a failed write is raised here.
+        """
+        future = Future()
+        if self.durability == 'sync':
+            self._write_batch([(record, future)])
+            future.result()
+            return future
+        if self._stopped.is_set():
+            raise RuntimeError("submission writer is stopped")
+        self._queue.put((record, future))
+        if self.durability == 'group':
+            future.result()
+        return future
+
+    def _run(self):
+        """Writer thread: collect a batch, commit it, repeat"""
+        while not (self._stopped.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            batch = [first]
+            # Anything queued while the previous commit ran joins this batch;
+            # otherwise wait up to flush_interval for company.
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    if remaining > 0:
+                        batch.append(self._queue.get(timeout=remaining))
+                    else:
+                        batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write_batch(batch)
+
+    def _write_batch(self, batch):
+        """Write a batch in one transaction, falling back to one at a time on error"""
+        try:
+            conn = self.pool.acquire()
+            cursor = conn.cursor()
+            try:
+                for record, _ in batch:
+                    self.apply(cursor, record)
+                conn.commit()
+                committed = batch
+            except Exception as e:
+                conn.rollback()
+                if len(batch) == 1:
+                    raise
+                print(f"[DB ERROR] Batch of {len(batch)} submissions failed, retrying individually: {e}")
+                committed = []
+                for item in batch:
+                    try:
+                        self.apply(cursor, item[0])
+                        conn.commit()
+                        committed.append(item)
+                    except Exception as item_error:
+                        conn.rollback()
+                        self._fail(item[1], item_error)
+        except Exception as e:
+            print(f"[DB ERROR] Failed to write submissions: {e}")
+            for _, future in batch:
+                self._fail(future, e)
+            return
+        finally:
+            if 'conn' in locals():
+                self.pool.release(conn)
+
+        with self._stats_lock:
+            self._batches += 1
+            self._records += len(committed)
+        # Listeners run before callers are released, so a caller that reads
+        # back straight after submitting sees caches already invalidated
+        records = [record for record, _ in committed]
+        for callback in self._listeners:
+            try:
+                callback(records)
+            except Exception as e:
+                print(f"[ERROR] Submission commit listener failed: {e}")
+        for _, future in committed:
+            future.set_result(True)
+
+    def _fail(self, future, error):
+        """Resolve a record's future with its write error"""
+        with self._stats_lock:
+            self._failures += 1
+        if not future.done():
+            future.set_exception(error)
+
+    def stop(self, timeout=10):
+        """Flush everything still queued and stop the writer thread"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def stats(self):
+        """Return batch and record counters"""
+        with self._stats_lock:
+            return {
+                'durability': self.durability,
+                'pending': self._queue.qsize(),
+                'batches': self._batches,
+                'records': self._records,
+                'failures': self._failures,
+                'avg_batch_size': self._records / self._batches if self._batches else 0.0
+            }